@@ -1,9 +1,226 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
 from passlib.hash import bcrypt
 
 
+class AuthServiceBusyError(Exception):
+    pass
+
+
+BCRYPT_PROFILES = {"test": 4, "development": 10, "production": 12}
+
+_hasher = None
+
+
+def bcrypt_rounds() -> int:
+    rounds = os.getenv("BCRYPT_ROUNDS")
+    if rounds:
+        return int(rounds)
+    profile = (os.getenv("AUTH_PROFILE") or "production").strip().lower()
+    if profile not in BCRYPT_PROFILES:
+        raise ValueError(
+            f"Unknown AUTH_PROFILE '{profile}'. Expected one of: {', '.join(BCRYPT_PROFILES)}."
+        )
+    return BCRYPT_PROFILES[profile]
+
+
+def configure_hasher(rounds: int | None = None):
+    global _hasher
+    rounds = rounds or bcrypt_rounds()
+    _hasher = bcrypt.using(
+        rounds=rounds, min_desired_rounds=rounds, max_desired_rounds=rounds
+    )
+    return _hasher
+
+
+def get_hasher():
+    return _hasher or configure_hasher()
+
+
 def hash_password(raw: str) -> str:
-    return bcrypt.hash(raw)
+    return get_hasher().hash(raw)
 
 
 def verify_password(raw: str, hashed: str) -> bool:
     return bcrypt.verify(raw, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    return get_hasher().needs_update(hashed)
+
+
+def _timed(func, *args):
+    started = perf_counter()
+    result = func(*args)
+    return result, perf_counter() - started
+
+
+class AuthService:
+    """Runs bcrypt on a worker pool so callers never block on hashing.
+
+    At most ``max_pending`` jobs may be queued or running; further submissions
+    wait up to ``queue_timeout`` seconds and then raise ``AuthServiceBusyError``.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_pending: int | None = None,
+        queue_timeout: float = 5.0,
+        use_processes: bool = False,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.queue_timeout = queue_timeout
+        executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor = executor(max_workers=self.workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_pending_seen": 0,
+            "hash_count": 0,
+            "hash_time": 0.0,
+            "verify_count": 0,
+            "verify_time": 0.0,
+        }
+
+    def submit_hash(self, raw: str, block: bool = False) -> Future:
+        return self._submit("hash", hash_password, raw, block=block)
+
+    def submit_verify(self, raw: str, hashed: str, block: bool = False) -> Future:
+        return self._submit("verify", verify_password, raw, hashed, block=block)
+
+    async def hash(self, raw: str) -> str:
+        return await asyncio.wrap_future(
+            await self._asubmit("hash", hash_password, raw)
+        )
+
+    async def verify(self, raw: str, hashed: str) -> bool:
+        return await asyncio.wrap_future(
+            await self._asubmit("verify", verify_password, raw, hashed)
+        )
+
+    def hash_many(self, raws: list[str]) -> list[str]:
+        futures = [self.submit_hash(raw, block=True) for raw in raws]
+        return [future.result() for future in futures]
+
+    def _submit(self, kind: str, func, *args, block: bool) -> Future:
+        if not self._slots.acquire(timeout=None if block else self.queue_timeout):
+            self._reject()
+        return self._start(kind, func, *args)
+
+    async def _asubmit(self, kind: str, func, *args) -> Future:
+        """``_submit`` for coroutines: a full queue is waited on off the event loop."""
+        if not self._slots.acquire(blocking=False):
+            waiter = asyncio.get_running_loop().run_in_executor(
+                None, self._slots.acquire, True, self.queue_timeout
+            )
+            try:
+                acquired = await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                waiter.add_done_callback(self._release_abandoned_slot)
+                raise
+            if not acquired:
+                self._reject()
+        return self._start(kind, func, *args)
+
+    def _release_abandoned_slot(self, waiter) -> None:
+        if not waiter.cancelled() and waiter.exception() is None and waiter.result():
+            self._slots.release()
+
+    def _reject(self) -> None:
+        with self._lock:
+            self._stats["rejected"] += 1
+        raise AuthServiceBusyError(
+            f"Auth queue is full ({self.max_pending} pending jobs)."
+        )
+
+    def _start(self, kind: str, func, *args) -> Future:
+        with self._lock:
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["max_pending_seen"] = max(
+                self._stats["max_pending_seen"], self._pending
+            )
+
+        result = Future()
+        try:
+            job = self._executor.submit(_timed, func, *args)
+        except BaseException:
+            self._finished()
+            raise
+        job.add_done_callback(lambda job: self._complete(kind, job, result))
+        return result
+
+    def _complete(self, kind: str, job: Future, result: Future) -> None:
+        try:
+            value, elapsed = job.result()
+        except BaseException as exc:
+            self._finished(failed=True)
+            result.set_exception(exc)
+            return
+        with self._lock:
+            self._stats[f"{kind}_count"] += 1
+            self._stats[f"{kind}_time"] += elapsed
+        self._finished()
+        result.set_result(value)
+
+    def _finished(self, failed: bool = False) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._stats["failed" if failed else "completed"] += 1
+        self._slots.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                **self._stats,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+            }
+        for kind in ("hash", "verify"):
+            count = stats[f"{kind}_count"]
+            stats[f"avg_{kind}_time"] = stats[f"{kind}_time"] / count if count else 0.0
+        return stats
+
+
+_service: AuthService | None = None
+_service_lock = threading.Lock()
+
+
+def configure_auth_service(**settings) -> AuthService:
+    global _service
+    defaults = {
+        "workers": int(os.getenv("AUTH_WORKERS") or 0) or None,
+        "max_pending": int(os.getenv("AUTH_MAX_PENDING") or 0) or None,
+        "queue_timeout": float(os.getenv("AUTH_QUEUE_TIMEOUT") or 5),
+        "use_processes": (os.getenv("AUTH_USE_PROCESSES") or "").lower()
+        in ("1", "true", "yes", "on"),
+    }
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown(wait=False)
+        _service = AuthService(**{**defaults, **settings})
+    return _service
+
+
+def get_auth_service() -> AuthService:
+    if _service is None:
+        configure_auth_service()
+    return _service
+
+
+def get_auth_stats() -> dict:
+    return get_auth_service().stats()
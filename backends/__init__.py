@@ -0,0 +1,24 @@
+import os
+from backends.base import Backend, DatabaseError
+
+try:
+    from mysql.connector import Error as MySQLError
+except ImportError:
+    MySQLError = DatabaseError
+
+# Catch-all for driver errors: models test ``err.errno`` against MySQL codes,
+# which the SQLite backend translates to.
+Error = (DatabaseError, MySQLError)
+
+
+def backend_from_env() -> Backend:
+    name = (os.getenv("DB_BACKEND") or "mysql").strip().lower()
+    if name == "mysql":
+        from backends.mysql import MySQLBackend
+
+        return MySQLBackend()
+    if name == "sqlite":
+        from backends.sqlite import SQLiteBackend
+
+        return SQLiteBackend(os.getenv("DB_SQLITE_PATH") or "library.db")
+    raise ValueError(f"Unknown DB_BACKEND '{name}'. Expected 'mysql' or 'sqlite'.")
@@ -0,0 +1,42 @@
+class DatabaseError(Exception):
+    """A driver error translated to MySQL's error numbers (1062, 1451, ...)."""
+
+    def __init__(self, errno: int | None, msg: str, sqlstate: str | None = None):
+        self.errno = errno
+        self.msg = msg
+        self.sqlstate = sqlstate
+        super().__init__(f"{errno} ({sqlstate}): {msg}" if errno else msg)
+
+
+class Backend:
+    """Connection factory plus the few SQL fragments that differ per engine."""
+
+    name = "base"
+
+    def connect(self):
+        raise NotImplementedError
+
+    def begin(self, conn) -> None:
+        """Open the transaction of a unit of work on ``conn``."""
+
+    def for_update(self, alias: str) -> str:
+        return ""
+
+    def auto_increment_step(self, cur) -> int:
+        """Gap between consecutive ids of one multi-row INSERT."""
+        return 1
+
+    def excluded(self, column: str) -> str:
+        """Reference the proposed value of ``column`` inside an upsert."""
+        raise NotImplementedError
+
+    def upsert(
+        self, cur, table: str, insert: str, values, key: str, assignments: str
+    ) -> tuple[dict, bool]:
+        """Run ``insert``; on a ``key`` conflict apply ``assignments`` instead.
+
+        ``cur`` must be a dictionary cursor. Returns the row as stored after
+        the statement and whether it was newly inserted. Engines without
+        ``RETURNING`` (MySQL) read the row back with a second statement.
+        """
+        raise NotImplementedError
@@ -0,0 +1,42 @@
+import os
+import mysql.connector
+from backends.base import Backend
+
+
+class MySQLBackend(Backend):
+    name = "mysql"
+
+    def connect(self):
+        return mysql.connector.connect(
+            host=os.getenv("DB_HOST"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASS"),
+            database=os.getenv("DB_NAME"),
+            consume_results=True,
+        )
+
+    def for_update(self, alias: str) -> str:
+        return f" FOR UPDATE OF {alias}"
+
+    def auto_increment_step(self, cur) -> int:
+        cur.execute("SELECT @@auto_increment_increment")
+        (step,) = cur.fetchone()
+        return int(step)
+
+    def excluded(self, column: str) -> str:
+        return f"VALUES({column})"
+
+    def upsert(
+        self, cur, table: str, insert: str, values, key: str, assignments: str
+    ) -> tuple[dict, bool]:
+        cur.execute(
+            f"{insert} ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), {assignments}",
+            values,
+        )
+        # Affected rows: 1 for an insert, 2 for a changed row, 0 for an
+        # unchanged one (FOUND_ROWS is off by default).
+        created = cur.rowcount == 1
+        # No RETURNING here: re-select, since on a duplicate the stored row
+        # (e.g. a paid fine) differs from the values just sent.
+        cur.execute(f"SELECT * FROM {table} WHERE id = %s", (cur.lastrowid,))
+        return cur.fetchone(), created
@@ -0,0 +1,251 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from backends.base import Backend, DatabaseError
+
+SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "sqlite_schema.sql"
+)
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, datetime.isoformat)
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter("DECIMAL", lambda value: Decimal(value.decode()))
+
+_NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+
+
+def translate_query(operation: str) -> str:
+    """Rewrite the MySQL driver's ``%s``/``%(name)s`` markers as SQLite's."""
+    return _NAMED_PARAM.sub(r":\1", operation).replace("%s", "?").replace("%%", "%")
+
+
+def translate_error(err: sqlite3.Error, operation: str) -> DatabaseError:
+    message = str(err)
+    if isinstance(err, sqlite3.IntegrityError):
+        if message.startswith("UNIQUE constraint failed"):
+            key = message.split(":", 1)[1].strip()
+            return DatabaseError(1062, f"Duplicate entry for key '{key}'", "23000")
+        if message.startswith("FOREIGN KEY constraint failed"):
+            if operation.lstrip().upper().startswith(("DELETE", "UPDATE")):
+                return DatabaseError(
+                    1451,
+                    "Cannot delete or update a parent row: "
+                    "a foreign key constraint fails",
+                    "23000",
+                )
+            return DatabaseError(
+                1452,
+                "Cannot add or update a child row: a foreign key constraint fails",
+                "23000",
+            )
+        if message.startswith("NOT NULL constraint failed"):
+            column = message.split(":", 1)[1].strip()
+            return DatabaseError(1048, f"Column '{column}' cannot be null", "23000")
+        if message.startswith("CHECK constraint failed"):
+            return DatabaseError(3819, message, "HY000")
+        # RAISE(ABORT, ...) in a trigger, the port of a MySQL SIGNAL.
+        return DatabaseError(1644, message, "45000")
+    if isinstance(err, sqlite3.OperationalError) and "locked" in message:
+        return DatabaseError(1205, f"Lock wait timeout exceeded: {message}", "HY000")
+    return DatabaseError(None, message)
+
+
+class SQLiteCursor:
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False) -> None:
+        self._cursor = cursor
+        self._dictionary = dictionary
+        self.lastrowid = None
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def with_rows(self) -> bool:
+        return self._cursor.description is not None
+
+    def execute(self, operation: str, params=None):
+        try:
+            self._cursor.execute(translate_query(operation), params or ())
+        except sqlite3.Error as err:
+            raise translate_error(err, operation) from err
+        self.lastrowid = self._cursor.lastrowid
+
+    def executemany(self, operation: str, seq_params):
+        seq_params = list(seq_params)
+        try:
+            self._cursor.executemany(translate_query(operation), seq_params)
+            if operation.lstrip().upper().startswith("INSERT") and seq_params:
+                # Like MySQL, report the first id of the batch; rowids of one
+                # multi-row insert are consecutive while the write lock is held.
+                (last,) = self._cursor.connection.execute(
+                    "SELECT last_insert_rowid()"
+                ).fetchone()
+                self.lastrowid = last - len(seq_params) + 1
+        except sqlite3.Error as err:
+            raise translate_error(err, operation) from err
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self) -> list:
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return (self._row(row) for row in self._cursor)
+
+    def close(self) -> None:
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class SQLiteConnection:
+    """Gives a sqlite3 connection the surface of a mysql.connector one."""
+
+    unread_result = False
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._conn.in_transaction
+
+    def cursor(self, dictionary: bool = False, **kwargs) -> SQLiteCursor:
+        return SQLiteCursor(self._conn.cursor(), dictionary)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+
+    def consume_results(self) -> None:
+        pass
+
+    def is_connected(self) -> bool:
+        try:
+            self._conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class SQLiteBackend(Backend):
+    """Embedded engine: a WAL-mode file, or a shared in-memory database.
+
+    ``:memory:`` is shared by every connection of this backend and lives as
+    long as the backend does. It uses the memdb VFS rather than a shared
+    cache, so writers wait on the busy timeout instead of failing with
+    "table is locked". The schema port is applied on first use.
+    """
+
+    name = "sqlite"
+    _memory_ids = 0
+
+    def __init__(self, path: str = "library.db", timeout: float = 30.0) -> None:
+        self.timeout = timeout
+        self._keeper = None
+        self._lock = threading.Lock()
+        self._ready = False
+        if path == ":memory:":
+            SQLiteBackend._memory_ids += 1
+            self.database = (
+                f"file:/library_{os.getpid()}_{SQLiteBackend._memory_ids}?vfs=memdb"
+            )
+            self.memory = True
+        else:
+            self.database = path
+            self.memory = False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            uri=self.memory,
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        if not self.memory:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _prepare(self) -> None:
+        with self._lock:
+            if self._ready:
+                return
+            conn = self._open()
+            with open(SCHEMA_PATH, encoding="utf-8") as f:
+                conn.executescript(f.read())
+            if self.memory:
+                self._keeper = conn
+            else:
+                conn.close()
+            self._ready = True
+
+    def connect(self) -> SQLiteConnection:
+        if not self._ready:
+            self._prepare()
+        return SQLiteConnection(self._open())
+
+    def close(self) -> None:
+        if self._keeper is not None:
+            self._keeper.close()
+            self._keeper = None
+            self._ready = False
+
+    def begin(self, conn) -> None:
+        # sqlite3 only begins at the first write, so a unit of work would read
+        # (e.g. borrow eligibility) before holding any lock. Take the write
+        # lock up front; other units wait on the busy timeout.
+        with conn.cursor() as cur:
+            cur.execute("BEGIN IMMEDIATE")
+
+    def excluded(self, column: str) -> str:
+        return f"excluded.{column}"
+
+    def upsert(
+        self, cur, table: str, insert: str, values, key: str, assignments: str
+    ) -> tuple[dict, bool]:
+        # RETURNING can't tell an insert from an update, so try the plain
+        # insert first; both statements run under the write lock it takes.
+        cur.execute(f"{insert} ON CONFLICT({key}) DO NOTHING RETURNING *", values)
+        row = cur.fetchone()
+        if row is not None:
+            return row, True
+        cur.execute(
+            f"{insert} ON CONFLICT({key}) DO UPDATE SET {assignments} RETURNING *",
+            values,
+        )
+        return cur.fetchone(), False
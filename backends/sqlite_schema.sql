@@ -0,0 +1,165 @@
+-- SQLite port of schema.sql plus migrations 0001-0005. Keep it in step with
+-- both when the MySQL schema changes.
+
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY,
+  name VARCHAR(255) NOT NULL,
+  email VARCHAR(255) UNIQUE NOT NULL,
+  password VARCHAR(255) NOT NULL,
+  joined_date DATE NOT NULL,
+  role TEXT NOT NULL DEFAULT 'member' CHECK (role IN ('member', 'admin'))
+);
+
+CREATE TABLE IF NOT EXISTS authors (
+  id INTEGER PRIMARY KEY,
+  name VARCHAR(255) UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS publishers (
+  id INTEGER PRIMARY KEY,
+  name VARCHAR(255) UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+  id INTEGER PRIMARY KEY,
+  name VARCHAR(255) UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS books (
+  id INTEGER PRIMARY KEY,
+  isbn VARCHAR(20) UNIQUE NOT NULL,
+  title VARCHAR(255) NOT NULL,
+  author_id INTEGER REFERENCES authors(id),
+  publisher_id INTEGER REFERENCES publishers(id),
+  category_id INTEGER REFERENCES categories(id),
+  total_copies INTEGER DEFAULT 1,
+  available_copies INTEGER DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS loans (
+  id INTEGER PRIMARY KEY,
+  user_id INTEGER REFERENCES users(id),
+  book_id INTEGER REFERENCES books(id),
+  loan_date DATE NOT NULL,
+  due_date DATE NOT NULL,
+  return_date DATE
+);
+
+CREATE TABLE IF NOT EXISTS fines (
+  id INTEGER PRIMARY KEY,
+  user_id INTEGER REFERENCES users(id),
+  loan_id INTEGER REFERENCES loans(id),
+  amount DECIMAL(6,2),
+  paid BOOLEAN DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+  session_id VARCHAR(64) PRIMARY KEY,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  expires_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_account_summary (
+  user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+  active_loans INTEGER NOT NULL DEFAULT 0,
+  unpaid_fines INTEGER NOT NULL DEFAULT 0,
+  outstanding_total DECIMAL(10,2) NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_books_author ON books (author_id);
+CREATE INDEX IF NOT EXISTS idx_books_publisher ON books (publisher_id);
+CREATE INDEX IF NOT EXISTS idx_books_category ON books (category_id);
+CREATE INDEX IF NOT EXISTS idx_loans_user_return ON loans (user_id, return_date);
+CREATE INDEX IF NOT EXISTS idx_loans_book_return ON loans (book_id, return_date);
+CREATE INDEX IF NOT EXISTS idx_fines_user_paid ON fines (user_id, paid);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_fines_loan ON fines (loan_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
+CREATE INDEX IF NOT EXISTS idx_users_admin ON users (role) WHERE role = 'admin';
+
+-- Single admin: an indexed EXISTS stands in for MySQL's unique admin_flag.
+
+CREATE TRIGGER IF NOT EXISTS prevent_second_admin_insert
+BEFORE INSERT ON users
+FOR EACH ROW WHEN NEW.role = 'admin'
+BEGIN
+  SELECT RAISE(ABORT, 'Only one admin is allowed.')
+  WHERE EXISTS (SELECT 1 FROM users WHERE role = 'admin');
+END;
+
+CREATE TRIGGER IF NOT EXISTS prevent_second_admin_update
+BEFORE UPDATE OF role ON users
+FOR EACH ROW WHEN NEW.role = 'admin' AND OLD.role != 'admin'
+BEGIN
+  SELECT RAISE(ABORT, 'Only one admin is allowed.')
+  WHERE EXISTS (SELECT 1 FROM users WHERE role = 'admin');
+END;
+
+-- Account summary maintenance (migration 0005). Every user gets a row on
+-- insert, so the loan and fine triggers only ever update.
+
+CREATE TRIGGER IF NOT EXISTS summary_user_insert
+AFTER INSERT ON users
+FOR EACH ROW
+BEGIN
+  INSERT OR IGNORE INTO user_account_summary (user_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS summary_loan_insert
+AFTER INSERT ON loans
+FOR EACH ROW WHEN NEW.return_date IS NULL
+BEGIN
+  UPDATE user_account_summary SET active_loans = active_loans + 1
+  WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS summary_loan_update
+AFTER UPDATE ON loans
+FOR EACH ROW
+BEGIN
+  UPDATE user_account_summary SET active_loans = active_loans - 1
+  WHERE user_id = OLD.user_id AND OLD.return_date IS NULL;
+  UPDATE user_account_summary SET active_loans = active_loans + 1
+  WHERE user_id = NEW.user_id AND NEW.return_date IS NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS summary_loan_delete
+AFTER DELETE ON loans
+FOR EACH ROW WHEN OLD.return_date IS NULL
+BEGIN
+  UPDATE user_account_summary SET active_loans = active_loans - 1
+  WHERE user_id = OLD.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS summary_fine_insert
+AFTER INSERT ON fines
+FOR EACH ROW WHEN NOT NEW.paid
+BEGIN
+  UPDATE user_account_summary
+  SET unpaid_fines = unpaid_fines + 1,
+      outstanding_total = outstanding_total + COALESCE(NEW.amount, 0)
+  WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS summary_fine_update
+AFTER UPDATE ON fines
+FOR EACH ROW
+BEGIN
+  UPDATE user_account_summary
+  SET unpaid_fines = unpaid_fines - 1,
+      outstanding_total = outstanding_total - COALESCE(OLD.amount, 0)
+  WHERE user_id = OLD.user_id AND NOT OLD.paid;
+  UPDATE user_account_summary
+  SET unpaid_fines = unpaid_fines + 1,
+      outstanding_total = outstanding_total + COALESCE(NEW.amount, 0)
+  WHERE user_id = NEW.user_id AND NOT NEW.paid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS summary_fine_delete
+AFTER DELETE ON fines
+FOR EACH ROW WHEN NOT OLD.paid
+BEGIN
+  UPDATE user_account_summary
+  SET unpaid_fines = unpaid_fines - 1,
+      outstanding_total = outstanding_total - COALESCE(OLD.amount, 0)
+  WHERE user_id = OLD.user_id;
+END;
@@ -0,0 +1,128 @@
+"""Compare the single-admin triggers with the unique generated-column index.
+
+Both mechanisms are installed on scratch copies of the users table, which are
+pre-filled with members and then timed on member inserts and on rejected
+attempts to add a second admin. The real users table is never touched.
+
+    python -m benchmarks.user_insert_throughput [existing_rows] [inserts]
+"""
+
+import sys
+from time import perf_counter
+from db import get_connection
+
+COLUMNS = """
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(255) NOT NULL,
+  email VARCHAR(255) UNIQUE NOT NULL,
+  password VARCHAR(255) NOT NULL,
+  joined_date DATE NOT NULL,
+  role ENUM('member', 'admin') NOT NULL DEFAULT 'member'
+"""
+
+SETUPS = {
+    "triggers (COUNT(*) scan)": [
+        f"CREATE TABLE bench_users_trigger ({COLUMNS})",
+        """
+        CREATE TRIGGER bench_prevent_second_admin
+        BEFORE INSERT ON bench_users_trigger
+        FOR EACH ROW
+        BEGIN
+          IF NEW.role = 'admin' THEN
+            IF (SELECT COUNT(*) FROM bench_users_trigger WHERE role = 'admin') > 0 THEN
+              SIGNAL SQLSTATE '45000'
+              SET MESSAGE_TEXT = 'Only one admin is allowed.';
+            END IF;
+          END IF;
+        END
+        """,
+    ],
+    "unique generated column": [
+        f"""
+        CREATE TABLE bench_users_index ({COLUMNS},
+          admin_flag TINYINT
+            GENERATED ALWAYS AS (IF(role = 'admin', 1, NULL)) VIRTUAL INVISIBLE,
+          UNIQUE INDEX uq_bench_single_admin (admin_flag))
+        """,
+    ],
+}
+
+INSERT = (
+    "INSERT INTO {table} (name, email, password, joined_date, role) "
+    "VALUES (%s, %s, 'x', CURRENT_DATE, %s)"
+)
+
+
+def table_name(setup: list[str]) -> str:
+    return setup[0].split()[2]
+
+
+def fill(cur, table: str, start: int, count: int, chunk: int = 1000) -> None:
+    query = INSERT.format(table=table)
+    for offset in range(start, start + count, chunk):
+        stop = min(offset + chunk, start + count)
+        cur.executemany(
+            query,
+            [
+                (f"User {i}", f"user{i}@bench.test", "member")
+                for i in range(offset, stop)
+            ],
+        )
+
+
+def run(existing_rows: int, inserts: int) -> None:
+    admin_attempts = max(1, inserts // 10)
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            for label, setup in SETUPS.items():
+                table = table_name(setup)
+                cur.execute(f"DROP TABLE IF EXISTS {table}")
+                for statement in setup:
+                    cur.execute(statement)
+                try:
+                    fill(cur, table, 0, existing_rows)
+                    cur.execute(
+                        INSERT.format(table=table),
+                        ("Admin", "admin@bench.test", "admin"),
+                    )
+                    conn.commit()
+
+                    started = perf_counter()
+                    for i in range(existing_rows, existing_rows + inserts):
+                        cur.execute(
+                            INSERT.format(table=table),
+                            (f"User {i}", f"user{i}@bench.test", "member"),
+                        )
+                    conn.commit()
+                    member_elapsed = perf_counter() - started
+
+                    rejected = 0
+                    started = perf_counter()
+                    for i in range(admin_attempts):
+                        try:
+                            cur.execute(
+                                INSERT.format(table=table),
+                                (f"Admin {i}", f"admin{i}@bench.test", "admin"),
+                            )
+                        except Exception:
+                            rejected += 1
+                    conn.rollback()
+                    admin_elapsed = perf_counter() - started
+                finally:
+                    cur.execute(f"DROP TABLE IF EXISTS {table}")
+
+                print(f"{label}:")
+                print(
+                    f"  member inserts: {inserts / member_elapsed:10.0f} rows/s"
+                    f"  ({inserts} rows over {existing_rows} existing)"
+                )
+                print(
+                    f"  admin attempts: {admin_elapsed / admin_attempts * 1000:10.2f} ms each"
+                    f"  ({rejected}/{admin_attempts} rejected)"
+                )
+
+
+if __name__ == "__main__":
+    existing = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    run(existing, count)
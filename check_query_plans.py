@@ -0,0 +1,93 @@
+import sys
+from db import get_connection, transaction
+from instrumentation import count_queries
+from models.book import Book
+from models.exceptions import BookNotFound, FineNotFound, LoanNotFound, UserNotFound
+from models.fine import Fine
+from models.loan import Loan
+from models.user import User
+from models.validators import LoanValidator
+
+DEFAULT_MAX_SCAN_ROWS = 1000
+
+HOT_CALLS = {
+    "Loan.get_by_user (active)": lambda: Loan.get_by_user(1, "active"),
+    "Loan.get_by_book (active)": lambda: Loan.get_by_book(1, "active"),
+    "Fine.get_by_user": lambda: Fine.get_by_user(1),
+    "Fine.get_by_user (unpaid)": lambda: Fine.get_by_user(1, "unpaid"),
+    "Fine.get_by_loan": lambda: Fine.get_by_loan(1),
+    "Book.get_by_isbn": lambda: Book.get_by_isbn("0000000000"),
+    "Book.get_catalog": lambda: next(Book.get_catalog(page_size=1), None),
+    "Book.reserve_copies": lambda: Book.reserve_copies(1),
+    "LoanValidator.fetch_eligibility": lambda: LoanValidator.fetch_eligibility(1, 1),
+    "User.get_by_email": lambda: User.get_by_email("someone@example.com"),
+}
+
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+
+
+class _Rollback(Exception):
+    pass
+
+
+def hot_statements() -> dict[str, list[tuple[str, tuple]]]:
+    """Run each hot model call in a rolled back unit and collect its SQL."""
+    statements = {}
+    for name, call in HOT_CALLS.items():
+        with count_queries() as counter:
+            try:
+                with transaction():
+                    try:
+                        call()
+                    except (BookNotFound, FineNotFound, LoanNotFound, UserNotFound):
+                        pass
+                    raise _Rollback
+            except _Rollback:
+                pass
+        statements[name] = [
+            (record.statement, tuple(record.params or ()))
+            for record in counter.records
+            if record.statement.split(" ", 1)[0].upper() in EXPLAINABLE
+        ]
+    return statements
+
+
+def explain(query: str, params: tuple) -> list[dict]:
+    with get_connection() as conn:
+        with conn.cursor(dictionary=True) as cur:
+            cur.execute("EXPLAIN " + query, params)
+            return cur.fetchall()
+
+
+def check_plans(max_scan_rows: int = DEFAULT_MAX_SCAN_ROWS) -> list[str]:
+    failures = []
+    for name, queries in hot_statements().items():
+        for query, params in queries:
+            for row in explain(query, params):
+                table = row.get("table")
+                if table is None:
+                    continue
+                rows = row.get("rows") or 0
+                if row.get("type") != "ALL":
+                    print(f"✅ {name}: {table} via {row.get('key')}")
+                elif rows > max_scan_rows:
+                    print(f"❌ {name}: full table scan of {table} (~{rows} rows)")
+                    failures.append(f"{name} ({table})")
+                elif not row.get("possible_keys"):
+                    print(f"❌ {name}: full table scan of {table}, no usable index")
+                    failures.append(f"{name} ({table})")
+                else:
+                    print(
+                        f"⚠️  {name}: {table} scanned although {row['possible_keys']} "
+                        f"could be used (~{rows} rows, under {max_scan_rows})"
+                    )
+    return failures
+
+
+if __name__ == "__main__":
+    max_scan_rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MAX_SCAN_ROWS
+    failures = check_plans(max_scan_rows)
+    if failures:
+        print("\nFull table scans found in: " + ", ".join(failures))
+        sys.exit(1)
+    print("\nAll hot queries use an index.")
@@ -12,9 +12,11 @@ from models.publisher import Publisher
 from models.user import User
 from models.loan import Loan
 from models.fine import Fine
+from sessions import get_session_manager
 
 
 current_user = None
+current_session = None
 
 
 def add_book():
@@ -84,26 +86,23 @@ def add_category():
 
 def list_books():
     print("\n--- Book List ---")
-    books = Book.get_all()
-    for b in books:
+    for b in Book.get_catalog():
         sleep(0.15)
         print(
-            f"[{b.id}] {b.title}\n Publisher: {Publisher.get_by_id(b.publisher_id).name} Author: {Author.get_by_id(b.author_id).name} (Available: {b.available_copies})"
+            f"[{b.id}] {b.title}\n Publisher: {b.publisher_name} Author: {b.author_name} (Available: {b.available_copies})"
         )
 
 
 def list_users():
     print("\n--- User List ---")
-    users = User.get_all()
-    for u in users:
+    for u in User.iter_all():
         sleep(0.15)
         print(f"[{u.id}] {u.name} - {u.email}")
 
 
 def list_loans():
     print("\n--- Loan List ---")
-    loans = Loan.get_all()
-    for l in loans:
+    for l in Loan.iter_all():
         sleep(0.15)
         print(
             f"[{l.id}] Book ID: {l.book_id}, User ID: {l.user_id}, Loaned: {l.loan_date}, Due: {l.due_date}, Returned: {l.return_date or 'Not yet'}"
@@ -112,8 +111,7 @@ def list_loans():
 
 def list_fines():
     print("\n--- Fine List ---")
-    fines = Fine.get_all()
-    for f in fines:
+    for f in Fine.iter_all():
         sleep(0.15)
         print(
             f"[{f.id}] User ID: {f.user_id}, Loan ID: {f.loan_id}, Amount: {f.amount}, Status: {"Paid" if f.paid else "Not Paid"}"
@@ -267,9 +265,10 @@ def update_fine():
         print(f"Error: {e}")
 
 
-def menu(user: User):
-    global current_user
+def menu(user: User, session_token: str | None = None):
+    global current_user, current_session
     current_user = user
+    current_session = session_token
     while True:
         try:
             print(
@@ -294,6 +293,12 @@ def menu(user: User):
             )
             choice = input("Enter your choice: ")
 
+            session_manager = get_session_manager()
+            if choice != "0" and not session_manager.is_live(
+                current_session, current_user.id
+            ):
+                print("Your session has expired. Please log in again.")
+                break
             if choice == "1":
                 add_book()
             elif choice == "2":
@@ -1,20 +1,32 @@
 import sys
-from auth import verify_password
-from models.exceptions import UserNotFound, ValidationFailedError
+from auth import needs_rehash, verify_password
+from models.exceptions import (
+    DatabaseOperationError,
+    UserNotFound,
+    ValidationFailedError,
+)
 from models.user import User
+from sessions import get_session_manager
 
 current_user = None
+current_session = None
 
 
 def login():
-    global current_user
+    global current_user, current_session
     print("\n--- Login ---")
     email = input("Email: ").lower().strip()
     password = input("Password: ").strip()
     try:
         user = User.get_by_email(email)
         if verify_password(password, user.password):
+            if needs_rehash(user.password):
+                try:
+                    user.rehash_password(password)
+                except DatabaseOperationError:
+                    pass
             current_user = user
+            current_session = get_session_manager().create(user.id)
             print(f"Logged in as: {user.name} ({user.role})")
             return True
         else:
@@ -63,7 +75,8 @@ def menu():
                         from cli.admin import menu
                     else:
                         from cli.member import menu
-                    menu(current_user)
+                    menu(current_user, current_session)
+                    get_session_manager().revoke(current_session)
             elif choice == "2":
                 register_user()
             elif choice == "0":
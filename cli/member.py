@@ -1,6 +1,7 @@
 from datetime import date
 from auth import verify_password
-from models.author import Author
+from db import transaction
+from models.account_summary import AccountSummary
 from models.book import Book
 from models.exceptions import (
     BookNotFound,
@@ -11,24 +12,24 @@ from models.exceptions import (
 )
 from models.fine import Fine
 from models.loan import Loan
-from models.publisher import Publisher
 from models.user import User
+from sessions import get_session_manager
 
 current_user = None
+current_session = None
 
 
 def list_books():
     try:
         print("\n--- Book List ---")
-        books = Book.get_all()
-        if not books:
-            print("There are no books in database")
-            return
-
-        for b in books:
+        found = False
+        for b in Book.get_catalog():
+            found = True
             print(
-                f"[{b.id}] {b.title}\n Publisher: {Publisher.get_by_id(b.publisher_id).name} Author: {Author.get_by_id(b.author_id).name} (Available: {b.available_copies})"
+                f"[{b.id}] {b.title}\n Publisher: {b.publisher_name} Author: {b.author_name} (Available: {b.available_copies})"
             )
+        if not found:
+            print("There are no books in database")
     except BookNotFound as e:
         print(e)
 
@@ -37,9 +38,12 @@ def view_loans(status="all"):
     try:
         print("\n--- Your Loans ---")
         loans = Loan.get_by_user(current_user.id, status)
+        titles = {}
         for l in loans:
+            if l.book_id not in titles:
+                titles[l.book_id] = Book.get_by_id(l.book_id).title
             print(
-                f"Loan ID: {l.id}, Book Title: {Book.get_by_id(l.book_id).title}, Borrowed on: {l.loan_date}, Returned: {l.return_date if l.return_date else "Not returned yet"}"
+                f"Loan ID: {l.id}, Book Title: {titles[l.book_id]}, Borrowed on: {l.loan_date}, Returned: {l.return_date if l.return_date else "Not returned yet"}"
             )
         return True
     except LoanNotFound as e:
@@ -50,6 +54,10 @@ def view_loans(status="all"):
 def list_fines():
     try:
         print("\n--- Your Fines ---")
+        summary = AccountSummary.get_by_user(current_user.id)
+        print(
+            f"Unpaid fines: {summary.unpaid_fines}, Outstanding: {summary.outstanding_total}"
+        )
         fines = Fine.get_by_user(current_user.id)
         for f in fines:
             print(f"Fine ID: {f.id}, Loan ID: {f.loan_id}, Amount: {f.amount}")
@@ -74,16 +82,23 @@ def borrow_book():
 
 
 def return_book():
+    if AccountSummary.get_by_user(current_user.id).active_loans == 0:
+        print("\nYou have no books to return.")
+        return
     if not view_loans("active"):
         return
     print("\n--- Return Book ---")
     loan_id = int(input("Loan ID: "))
     try:
-        loan = Loan.get_by_id(loan_id=loan_id)
-        loan.return_date = date.today()
-        loan.save()
-
-        fine = loan.check_for_fine()
+        with transaction():
+            loan = Loan.get_by_id(loan_id=loan_id)
+            if loan.return_date:
+                print("This loan has already been returned.")
+                return
+            loan.return_date = date.today()
+            loan.save()
+
+            fine = loan.check_for_fine()
         if fine:
             print(f"A fine was issued for the delay in return amount: {fine.amount}")
         print("Book returned successfully.")
@@ -133,9 +148,10 @@ def update_profile():
         print(f"Error: {e}")
 
 
-def menu(user: User):
-    global current_user
+def menu(user: User, session_token: str | None = None):
+    global current_user, current_session
     current_user = user
+    current_session = session_token
     while True:
         try:
             print(
@@ -152,6 +168,12 @@ def menu(user: User):
             )
             choice = input("Enter your choice: ").strip()
 
+            session_manager = get_session_manager()
+            if choice != "0" and not session_manager.is_live(
+                current_session, current_user.id
+            ):
+                print("Your session has expired. Please log in again.")
+                break
             if choice == "1":
                 list_books()
             elif choice == "2":
@@ -9,7 +9,7 @@ echo
 # Set variables
 MYSQL_PATH="/usr/bin/mysql"
 SQL_FILE="/home/work/Library/schema.sql"
-TRIGGER_FILE="/home/work/Library/admin_trigger.sql"
+PROJECT_DIR="/home/work/Library"
 DB_NAME="library"
 USER="root"
 
@@ -29,13 +29,9 @@ else
     echo "Schema file not found: $SQL_FILE"
 fi
 
-# Import trigger
-if [ -f "$TRIGGER_FILE" ]; then
-    echo "Importing the trigger to ensure only one admin..."
-    sudo $MYSQL_PATH -u $USER $DB_NAME < "$TRIGGER_FILE"
-else
-    echo "Trigger file not found: $TRIGGER_FILE"
-fi
+# Apply migrations
+echo "Applying schema migrations..."
+(cd "$PROJECT_DIR" && python3 migrate.py up)
 
 echo
 echo "========================================"
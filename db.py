@@ -1,14 +1,719 @@
+import asyncio
 import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, copy_context
+from functools import partial
+from itertools import islice
+from typing import AsyncIterator, Iterator
+from time import monotonic
 from dotenv import load_dotenv
-import mysql.connector
+from backends import Backend, DatabaseError, Error, backend_from_env
+from instrumentation import InstrumentedConnection
 
 load_dotenv()
 
 
+class PoolExhaustedError(Exception):
+    pass
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def pool_settings_from_env() -> dict:
+    return {
+        "size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_POOL_MAX_OVERFLOW", 10),
+        "timeout": _env_float("DB_POOL_TIMEOUT", 30.0),
+        "idle_timeout": _env_float("DB_POOL_IDLE_TIMEOUT", 300.0),
+        "pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "ping_interval": _env_float("DB_POOL_PING_INTERVAL", 5.0),
+        "statement_cache_size": statement_cache_size(),
+    }
+
+
+def default_page_size() -> int:
+    return _env_int("DB_PAGE_SIZE", 1000)
+
+
+def default_chunk_size() -> int:
+    return _env_int("DB_BULK_CHUNK_SIZE", 1000)
+
+
+def statement_cache_size() -> int:
+    return _env_int("DB_STATEMENT_CACHE_SIZE", 32)
+
+
+_pool: "ConnectionPool | None" = None
+_pool_configured = False
+_pool_lock = threading.Lock()
+_backend: Backend | None = None
+
+
+def configure_backend(backend: Backend | None = None) -> Backend:
+    """Switch engines; the pool is rebuilt on next use for the new backend."""
+    global _backend, _pool, _pool_configured
+    with _pool_lock:
+        if _pool is not None:
+            _pool.dispose()
+        _pool, _pool_configured = None, False
+        _backend = backend or backend_from_env()
+    return _backend
+
+
+def get_backend() -> Backend:
+    global _backend
+    if _backend is None:
+        # Called from inside the pool's connect, so don't reset the pool here.
+        with _pool_lock:
+            if _backend is None:
+                _backend = backend_from_env()
+    return _backend
+
+
+def _connect():
+    return get_backend().connect()
+
+
+class CachedStatementCursor:
+    """Cursor whose statements run on prepared cursors kept by the connection."""
+
+    def __init__(self, cache: "StatementCache", dictionary: bool) -> None:
+        self._cache = cache
+        self._dictionary = dictionary
+        self._cursor = None
+
+    def __getattr__(self, name):
+        if self._cursor is None:
+            raise AttributeError(name)
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, operation, params=()):
+        operation, self._cursor = self._cache.checkout(operation, self._dictionary)
+        return self._cursor.execute(operation, params)
+
+    def close(self) -> None:
+        # The prepared cursor stays open for the next caller; drain what this
+        # one left unread so the connection can take other statements.
+        cursor, self._cursor = self._cursor, None
+        if cursor is not None and getattr(self._cache.conn, "unread_result", False):
+            cursor.fetchall()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class StatementCache:
+    """Server-side prepared statements of one connection, keyed by SQL text.
+
+    The least recently used statement is deallocated once ``size`` are open.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn, size: int) -> None:
+        self._pool = pool
+        self.conn = conn
+        self.size = size
+        self._cursors = OrderedDict()
+
+    def cursor(self, dictionary: bool = False) -> CachedStatementCursor:
+        return CachedStatementCursor(self, dictionary)
+
+    def checkout(self, operation: str, dictionary: bool) -> tuple:
+        key = (operation, dictionary)
+        entry = self._cursors.get(key)
+        if entry is not None:
+            self._cursors.move_to_end(key)
+            self._pool._count("statement_hits")
+            return entry
+        self._pool._count("statement_misses")
+        # mysql.connector re-prepares unless it sees the very same string
+        # object, so the cache hands back the one the cursor was prepared with.
+        entry = (operation, self.conn.cursor(prepared=True, dictionary=dictionary))
+        self._cursors[key] = entry
+        if len(self._cursors) > self.size:
+            _, (_, evicted) = self._cursors.popitem(last=False)
+            self._pool._count("statement_evictions")
+            try:
+                evicted.close()
+            except Exception:
+                pass
+        return entry
+
+
+class PooledConnection:
+    """Proxy handed out by the pool; closing it returns the connection.
+
+    ``cursor(prepared=True)`` draws on the connection's statement cache.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn) -> None:
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, prepared: bool = False, **kwargs):
+        if prepared and self._pool.statement_cache_size > 0:
+            return self._pool.statement_cache(self._conn).cursor(**kwargs)
+        return self._conn.cursor(*args, **kwargs)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect,
+        size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        pre_ping: bool = True,
+        ping_interval: float = 5.0,
+        statement_cache_size: int = 32,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self._connect = connect
+        self.size = size
+        self.max_overflow = max(0, max_overflow)
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.pre_ping = pre_ping
+        self.ping_interval = ping_interval
+        self.statement_cache_size = statement_cache_size
+        self._statement_caches = {}
+        self._idle = deque()
+        self._open = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "exhausted": 0,
+            "created": 0,
+            "discarded": 0,
+            "ping_failures": 0,
+            "statement_hits": 0,
+            "statement_misses": 0,
+            "statement_evictions": 0,
+        }
+
+    def connection(self) -> PooledConnection:
+        return PooledConnection(self, self.acquire())
+
+    def statement_cache(self, conn) -> StatementCache:
+        """The cache of a checked-out connection, created on first use."""
+        cache = self._statement_caches.get(id(conn))
+        if cache is None or cache.conn is not conn:
+            cache = StatementCache(self, conn, self.statement_cache_size)
+            with self._cond:
+                self._statement_caches[id(conn)] = cache
+        return cache
+
+    def _count(self, name: str) -> None:
+        with self._cond:
+            self._stats[name] += 1
+
+    def acquire(self):
+        conn, last_used = self._checkout()
+        if conn is None:
+            return self._create()
+        if self._is_usable(conn, last_used):
+            return conn
+        with self._cond:
+            self._stats["discarded"] += 1
+        self._close_quietly(conn)
+        return self._create()
+
+    def _checkout(self):
+        stale = []
+        waited_since = None
+        try:
+            with self._cond:
+                while True:
+                    now = monotonic()
+                    while self._idle:
+                        conn, last_used = self._idle.pop()
+                        if self.idle_timeout and now - last_used > self.idle_timeout:
+                            stale.append(conn)
+                            self._open -= 1
+                            self._stats["discarded"] += 1
+                            continue
+                        self._checked_out(waited_since)
+                        return conn, last_used
+
+                    if self._open < self.size + self.max_overflow:
+                        self._open += 1
+                        self._checked_out(waited_since)
+                        return None, None
+
+                    if waited_since is None:
+                        waited_since = now
+                        self._stats["waits"] += 1
+                    remaining = self.timeout - (now - waited_since)
+                    if remaining <= 0:
+                        self._stats["exhausted"] += 1
+                        self._stats["wait_time"] += now - waited_since
+                        raise PoolExhaustedError(
+                            f"No connection available within {self.timeout}s "
+                            f"(size={self.size}, max_overflow={self.max_overflow})."
+                        )
+                    self._cond.wait(remaining)
+        finally:
+            for conn in stale:
+                self._close_quietly(conn)
+
+    def _checked_out(self, waited_since) -> None:
+        self._in_use += 1
+        self._stats["checkouts"] += 1
+        if waited_since is not None:
+            self._stats["wait_time"] += monotonic() - waited_since
+
+    def _create(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def _is_usable(self, conn, last_used: float) -> bool:
+        if not self.pre_ping or monotonic() - last_used < self.ping_interval:
+            return True
+        try:
+            if conn.is_connected():
+                return True
+        except Exception:
+            pass
+        with self._cond:
+            self._stats["ping_failures"] += 1
+        return False
+
+    def release(self, conn) -> None:
+        try:
+            if getattr(conn, "unread_result", False):
+                conn.consume_results()
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            self._discard(conn, checked_out=True)
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            if len(self._idle) < self.size:
+                self._idle.append((conn, monotonic()))
+                self._cond.notify()
+                return
+            self._open -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+        self._close_quietly(conn)
+
+    def _discard(self, conn, checked_out: bool) -> None:
+        with self._cond:
+            self._open -= 1
+            if checked_out:
+                self._in_use -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+        self._close_quietly(conn)
+
+    def _close_quietly(self, conn) -> None:
+        with self._cond:
+            self._statement_caches.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def dispose(self) -> None:
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._stats["discarded"] += len(idle)
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            lookups = self._stats["statement_hits"] + self._stats["statement_misses"]
+            return {
+                **self._stats,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "statement_hit_rate": (
+                    self._stats["statement_hits"] / lookups if lookups else 0.0
+                ),
+            }
+
+
+def configure_pool(**settings) -> ConnectionPool | None:
+    global _pool, _pool_configured
+    with _pool_lock:
+        if _pool is not None:
+            _pool.dispose()
+        merged = {**pool_settings_from_env(), **settings}
+        _pool = ConnectionPool(_connect, **merged) if merged["size"] > 0 else None
+        _pool_configured = True
+    return _pool
+
+
+def get_pool() -> ConnectionPool | None:
+    if not _pool_configured:
+        configure_pool()
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    pool = get_pool()
+    return pool.stats() if pool is not None else {}
+
+
+class _CountingCursor:
+    def __init__(self, cursor, unit: "UnitOfWork") -> None:
+        self._cursor = cursor
+        self._unit = unit
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._unit.query_count += 1
+        return self._cursor.execute(operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._unit.query_count += 1
+        return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._cursor.close()
+
+
+class IdentityMap:
+    """Model instances loaded in one unit of work, keyed by class and id."""
+
+    def __init__(self) -> None:
+        self._objects = {}
+        self.hits = 0
+
+    def get(self, cls, record_id):
+        obj = self._objects.get((cls, record_id))
+        if obj is not None:
+            self.hits += 1
+        return obj
+
+    def add(self, obj) -> None:
+        self._objects[(type(obj), obj.id)] = obj
+
+    def expire(self, cls, record_id) -> None:
+        self._objects.pop((cls, record_id), None)
+
+    def expire_all(self) -> None:
+        self._objects.clear()
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+
+class UnitOfWork:
+    """One connection and one transaction shared by every model call inside it."""
+
+    def __init__(self, connection) -> None:
+        self.connection = connection
+        self.query_count = 0
+        self.identity_map = IdentityMap()
+        self._commit_hooks = []
+
+    def on_commit(self, callback) -> None:
+        self._commit_hooks.append(callback)
+
+    def run_commit_hooks(self) -> None:
+        hooks, self._commit_hooks = self._commit_hooks, []
+        for hook in hooks:
+            hook()
+
+    def cursor(self, *args, **kwargs) -> _CountingCursor:
+        return _CountingCursor(self.connection.cursor(*args, **kwargs), self)
+
+
+class _UnitOfWorkConnection:
+    def __init__(self, unit: UnitOfWork) -> None:
+        self._unit = unit
+
+    def __getattr__(self, name):
+        return getattr(self._unit.connection, name)
+
+    def cursor(self, *args, **kwargs) -> _CountingCursor:
+        return self._unit.cursor(*args, **kwargs)
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_current_unit: ContextVar[UnitOfWork | None] = ContextVar("unit_of_work", default=None)
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    return _current_unit.get()
+
+
+def on_commit(callback) -> None:
+    """Run ``callback`` once the current unit of work commits, or now outside one."""
+    unit = _current_unit.get()
+    if unit is None:
+        callback()
+    else:
+        unit.on_commit(callback)
+
+
+@contextmanager
+def transaction():
+    unit = _current_unit.get()
+    if unit is not None:
+        yield unit
+        return
+
+    conn = _checkout()
+    unit = UnitOfWork(conn)
+    token = _current_unit.set(unit)
+    try:
+        get_backend().begin(conn)
+        yield unit
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _current_unit.reset(token)
+        conn.close()
+    unit.run_commit_hooks()
+
+
+@asynccontextmanager
+async def atransaction():
+    """``transaction()`` for coroutines: the unit follows the task across awaits.
+
+    Statements of one unit run one at a time, so don't ``gather`` model calls
+    inside it.
+    """
+    unit = _current_unit.get()
+    if unit is not None:
+        yield unit
+        return
+
+    conn = await run_in_db_thread(_checkout)
+    unit = UnitOfWork(conn)
+    token = _current_unit.set(unit)
+    try:
+        await run_in_db_thread(get_backend().begin, conn)
+        yield unit
+        await run_in_db_thread(conn.commit)
+    except BaseException:
+        await run_in_db_thread(conn.rollback)
+        raise
+    finally:
+        _current_unit.reset(token)
+        await run_in_db_thread(conn.close)
+    unit.run_commit_hooks()
+
+
+def _checkout():
+    pool = get_pool()
+    conn = _connect() if pool is None else pool.connection()
+    return InstrumentedConnection(conn)
+
+
 def get_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASS"),
-        database=os.getenv("DB_NAME"),
-    )
+    unit = _current_unit.get()
+    if unit is not None:
+        return _UnitOfWorkConnection(unit)
+    return _checkout()
+
+
+def iter_by_key(
+    select: str,
+    key: str = "id",
+    where: str = "",
+    params: tuple = (),
+    page_size: int | None = None,
+) -> Iterator[dict]:
+    """Walk a query in keyset pages ordered by ``key``.
+
+    Each page is drained from an unbuffered cursor and the connection goes back
+    to the pool before its rows are yielded, so slow consumers never pin one.
+    """
+    page_size = page_size or default_page_size()
+    column = key.rsplit(".", 1)[-1]
+    last = None
+    while True:
+        clauses = [where] if where else []
+        page_params = list(params)
+        if last is not None:
+            clauses.append(f"{key} > %s")
+            page_params.append(last)
+        query = select
+        if clauses:
+            query += " WHERE " + " AND ".join(f"({c})" for c in clauses)
+        query += f" ORDER BY {key} LIMIT %s"
+        page_params.append(page_size)
+
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(query, page_params)
+                page = cur.fetchall()
+
+        yield from page
+        if len(page) < page_size:
+            return
+        last = page[-1][column]
+
+
+def bulk_insert(
+    query: str, rows: list[tuple], chunk_size: int | None = None, on_chunk=None
+) -> list[int]:
+    """Insert ``rows`` with multi-row executemany, committing every chunk.
+
+    InnoDB hands each multi-row INSERT a consecutive block of auto-increment
+    values, ``@@auto_increment_increment`` apart, starting at the one reported
+    in ``lastrowid``. A chunk whose row count shows it did not go in as one
+    statement is refused. ``on_chunk(offset, ids)`` runs after each chunk, so
+    rows committed before a later chunk fails still learn their ids.
+    """
+    chunk_size = chunk_size or default_chunk_size()
+    ids = []
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            step = get_backend().auto_increment_step(cur)
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start : start + chunk_size]
+                cur.executemany(query, chunk)
+                if cur.rowcount != len(chunk):
+                    raise DatabaseError(
+                        None,
+                        f"Bulk insert wrote {cur.rowcount} of {len(chunk)} rows; "
+                        "ids can't be derived from lastrowid.",
+                    )
+                first_id = cur.lastrowid
+                chunk_ids = list(range(first_id, first_id + len(chunk) * step, step))
+                conn.commit()
+                ids.extend(chunk_ids)
+                if on_chunk is not None:
+                    on_chunk(start, chunk_ids)
+    return ids
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def configure_db_executor(workers: int | None = None) -> ThreadPoolExecutor:
+    """Threads that run blocking model calls for coroutines.
+
+    Defaults to ``DB_ASYNC_WORKERS``, or one thread per connection the pool may
+    open, so queued calls wait for a thread rather than for a connection.
+    """
+    global _executor
+    if workers is None:
+        settings = pool_settings_from_env()
+        workers = _env_int(
+            "DB_ASYNC_WORKERS",
+            max(1, settings["size"] + settings["max_overflow"]),
+        )
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="db-worker"
+        )
+    return _executor
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    if _executor is None:
+        configure_db_executor()
+    return _executor
+
+
+async def run_in_db_thread(func, *args, **kwargs):
+    """Await ``func(*args, **kwargs)`` run on the DB executor.
+
+    The call sees the caller's context variables, so it joins an open
+    ``atransaction()``.
+    """
+    loop = asyncio.get_running_loop()
+    call = partial(copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_db_executor(), call)
+
+
+async def aiter_in_db_thread(
+    iterator: Iterator, batch_size: int | None = None
+) -> AsyncIterator:
+    """Drain a blocking iterator on the DB executor, a batch per hop."""
+    batch_size = batch_size or default_page_size()
+    iterator = iter(iterator)
+    while True:
+        batch = await run_in_db_thread(lambda: list(islice(iterator, batch_size)))
+        for item in batch:
+            yield item
+        if len(batch) < batch_size:
+            return
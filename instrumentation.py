@@ -0,0 +1,242 @@
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+logger = logging.getLogger("library.sql")
+
+_SKIPPED_MODULES = ("db", "instrumentation", "backends", "contextlib")
+
+
+class QueryRecord:
+    def __init__(
+        self, statement: str, caller: str, elapsed: float, params=None
+    ) -> None:
+        self.statement = statement
+        self.params = params
+        self.caller = caller
+        self.elapsed = elapsed
+        self.rows = 0
+        self.stats = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.caller}: {self.elapsed * 1000:.1f} ms, "
+            f"{self.rows} rows, {self.statement[:60]}>"
+        )
+
+
+class QueryCounter:
+    """Statements issued inside one ``count_queries()`` block."""
+
+    def __init__(self) -> None:
+        self.records: list[QueryRecord] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_time(self) -> float:
+        return sum(record.elapsed for record in self.records)
+
+    def by_caller(self) -> dict[str, int]:
+        counts = {}
+        for record in self.records:
+            counts[record.caller] = counts.get(record.caller, 0) + 1
+        return counts
+
+
+def _env_flag(name: str) -> bool:
+    return (os.getenv(name) or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+_enabled = _env_flag("DB_INSTRUMENT")
+_slow_query_ms = float(os.getenv("DB_SLOW_QUERY_MS") or 200)
+_stats: dict[tuple[str, str], dict] = {}
+_stats_lock = threading.Lock()
+_counters: ContextVar[tuple[QueryCounter, ...]] = ContextVar(
+    "query_counters", default=()
+)
+
+
+def configure_instrumentation(
+    enabled: bool | None = None, slow_query_ms: float | None = None
+) -> None:
+    """Turn statement recording on or off; ``slow_query_ms`` <= 0 disables the log."""
+    global _enabled, _slow_query_ms
+    if enabled is not None:
+        _enabled = enabled
+    if slow_query_ms is not None:
+        _slow_query_ms = slow_query_ms
+
+
+def instrumentation_enabled() -> bool:
+    return _enabled or bool(_counters.get())
+
+
+@contextmanager
+def count_queries():
+    """Record every statement issued in the block, instrumentation on or off."""
+    counter = QueryCounter()
+    token = _counters.set(_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _counters.reset(token)
+
+
+def _calling_method() -> str:
+    """Innermost model method on the stack, else the first caller outside db."""
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.split(".", 1)[0] not in _SKIPPED_MODULES:
+            code = frame.f_code
+            name = f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+            if module.startswith("models.") and module != "models.aio":
+                return name.split(".", 2)[-1]
+            fallback = fallback or name
+        frame = frame.f_back
+    return fallback or "<unknown>"
+
+
+def _record(operation: str, elapsed: float, params=None) -> QueryRecord:
+    statement = " ".join(str(operation).split())
+    caller = _calling_method()
+    record = QueryRecord(statement, caller, elapsed, params)
+    for counter in _counters.get():
+        counter.records.append(record)
+    if _enabled:
+        with _stats_lock:
+            entry = _stats.setdefault(
+                (caller, statement),
+                {"count": 0, "total_time": 0.0, "max_time": 0.0, "rows": 0},
+            )
+            entry["count"] += 1
+            entry["total_time"] += elapsed
+            entry["max_time"] = max(entry["max_time"], elapsed)
+        record.stats = entry
+    if _slow_query_ms > 0 and elapsed * 1000 >= _slow_query_ms:
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s", elapsed * 1000, caller, statement
+        )
+    return record
+
+
+class InstrumentedCursor:
+    """Times each statement and counts the rows it returns or affects."""
+
+    def __init__(self, cursor) -> None:
+        self._cursor = cursor
+        self._record = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _add_rows(self, count: int) -> None:
+        if self._record is None or count <= 0:
+            return
+        self._record.rows += count
+        if self._record.stats is not None:
+            with _stats_lock:
+                self._record.stats["rows"] += count
+
+    def _timed(self, method, operation, *args, **kwargs):
+        started = perf_counter()
+        try:
+            result = method(operation, *args, **kwargs)
+        finally:
+            params = args[0] if args else kwargs.get("params")
+            self._record = _record(operation, perf_counter() - started, params)
+        if not getattr(self._cursor, "with_rows", False):
+            self._add_rows(self._cursor.rowcount)
+        return result
+
+    def execute(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, *args, **kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._add_rows(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._add_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._add_rows(len(rows))
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._add_rows(1)
+            yield row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._cursor.close()
+
+
+def instrument_cursor(cursor):
+    return InstrumentedCursor(cursor) if instrumentation_enabled() else cursor
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors are instrumented while recording is on."""
+
+    def __init__(self, conn) -> None:
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return instrument_cursor(self._conn.cursor(*args, **kwargs))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+
+def top_statements(n: int = 10) -> list[dict]:
+    """Statements with the highest cumulative time since the last reset."""
+    with _stats_lock:
+        rows = [
+            {"caller": caller, "statement": statement, **entry}
+            for (caller, statement), entry in _stats.items()
+        ]
+    rows.sort(key=lambda row: row["total_time"], reverse=True)
+    return rows[:n]
+
+
+def format_top_statements(n: int = 10) -> str:
+    lines = [f"{'total ms':>10} {'calls':>6} {'avg ms':>8} {'rows':>7}  caller"]
+    for row in top_statements(n):
+        lines.append(
+            f"{row['total_time'] * 1000:10.1f} {row['count']:6d} "
+            f"{row['total_time'] / row['count'] * 1000:8.2f} {row['rows']:7d}  "
+            f"{row['caller']}"
+        )
+        lines.append(f"{'':36}{row['statement'][:100]}")
+    return "\n".join(lines)
+
+
+def reset_query_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,125 @@
+"""Verify or rebuild user_account_summary from the loans and fines tables.
+
+    python -m jobs.account_summary check
+    python -m jobs.account_summary rebuild [--chunk-size N]
+
+check lists users whose counters drifted and exits non-zero if any did;
+rebuild recomputes every user's row, one chunk of users per transaction.
+"""
+
+import argparse
+import sys
+from time import perf_counter
+from db import default_chunk_size, get_connection
+
+RANGE = " AND {column} > %(low)s AND {column} <= %(high)s"
+
+
+def expected_query(ranged: bool = False) -> str:
+    """Recompute the counters, optionally only for user ids in (low, high]."""
+
+    def within(column: str) -> str:
+        return RANGE.format(column=column) if ranged else ""
+
+    return f"""
+        SELECT u.id AS user_id,
+               COALESCE(l.active_loans, 0) AS active_loans,
+               COALESCE(f.unpaid_fines, 0) AS unpaid_fines,
+               COALESCE(f.outstanding_total, 0) AS outstanding_total
+        FROM users u
+        LEFT JOIN (
+          SELECT user_id, COUNT(*) AS active_loans
+          FROM loans WHERE return_date IS NULL{within("user_id")}
+          GROUP BY user_id
+        ) l ON l.user_id = u.id
+        LEFT JOIN (
+          SELECT user_id, COUNT(*) AS unpaid_fines, SUM(amount) AS outstanding_total
+          FROM fines WHERE paid = FALSE{within("user_id")}
+          GROUP BY user_id
+        ) f ON f.user_id = u.id
+        WHERE TRUE{within("u.id")}
+    """
+
+
+DRIFTED = f"""
+    SELECT e.*, s.active_loans AS stored_active_loans,
+           s.unpaid_fines AS stored_unpaid_fines,
+           s.outstanding_total AS stored_outstanding_total
+    FROM ({expected_query()}) e
+    LEFT JOIN user_account_summary s ON s.user_id = e.user_id
+    WHERE s.user_id IS NULL
+       OR s.active_loans <> e.active_loans
+       OR s.unpaid_fines <> e.unpaid_fines
+       OR s.outstanding_total <> e.outstanding_total
+    ORDER BY e.user_id
+"""
+
+REBUILD_CHUNK = f"""
+    INSERT INTO user_account_summary
+      (user_id, active_loans, unpaid_fines, outstanding_total)
+    SELECT * FROM ({expected_query(ranged=True)}) e
+    ON DUPLICATE KEY UPDATE
+      active_loans = VALUES(active_loans),
+      unpaid_fines = VALUES(unpaid_fines),
+      outstanding_total = VALUES(outstanding_total)
+"""
+
+
+def check() -> list[dict]:
+    with get_connection() as conn:
+        with conn.cursor(dictionary=True) as cur:
+            cur.execute(DRIFTED)
+            return cur.fetchall()
+
+
+def rebuild(chunk_size: int | None = None) -> int:
+    chunk_size = chunk_size or default_chunk_size()
+    users = 0
+    last_id = 0
+    started = perf_counter()
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            while True:
+                cur.execute(
+                    """
+                    SELECT MAX(id), COUNT(*) FROM (
+                      SELECT id FROM users WHERE id > %s ORDER BY id LIMIT %s
+                    ) AS chunk
+                    """,
+                    (last_id, chunk_size),
+                )
+                high, count = cur.fetchone()
+                if not count:
+                    break
+                cur.execute(REBUILD_CHUNK, {"low": last_id, "high": high})
+                conn.commit()
+                last_id = high
+                users += count
+                print(
+                    f"  rebuilt users up to {high} "
+                    f"({users / (perf_counter() - started):,.0f} users/s)"
+                )
+    return users
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain user_account_summary.")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        print(f"Rebuilt the summary of {rebuild(args.chunk_size)} users.")
+    else:
+        drifted = check()
+        for row in drifted:
+            print(
+                f"  user {row['user_id']}: "
+                f"active loans {row['stored_active_loans']} -> {row['active_loans']}, "
+                f"unpaid fines {row['stored_unpaid_fines']} -> {row['unpaid_fines']}, "
+                f"outstanding {row['stored_outstanding_total']} -> {row['outstanding_total']}"
+            )
+        if drifted:
+            print(f"{len(drifted)} account summaries are out of date.")
+            sys.exit(1)
+        print("All account summaries are consistent.")
@@ -0,0 +1,14 @@
+def load_checkpoint(cur, job: str) -> int:
+    cur.execute("SELECT last_id FROM job_checkpoints WHERE job = %s", (job,))
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def save_checkpoint(cur, job: str, last_id: int) -> None:
+    cur.execute(
+        """
+        INSERT INTO job_checkpoints (job, last_id) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE last_id = VALUES(last_id)
+        """,
+        (job, last_id),
+    )
@@ -0,0 +1,92 @@
+"""Assess fines for every loan past its due date plus the grace period.
+
+Loans are swept in id order, one chunk per transaction, with one INSERT ...
+SELECT per chunk. The last committed loan id is stored in job_checkpoints, so
+an interrupted run resumes where it stopped; a finished run resets it.
+
+    python -m jobs.fine_sweep [--chunk-size N] [--as-of YYYY-MM-DD] [--restart]
+"""
+
+import argparse
+from datetime import date
+from time import perf_counter
+from db import default_chunk_size, get_connection
+from jobs.checkpoints import load_checkpoint, save_checkpoint
+from models.loan import FINE_GRACE_DAYS, FINE_PER_DAY
+
+JOB = "fine_sweep"
+
+NEXT_BOUNDARY = """
+    SELECT MAX(id), COUNT(*) FROM (
+      SELECT id FROM loans WHERE id > %s ORDER BY id LIMIT %s
+    ) AS chunk
+"""
+
+ASSESS_CHUNK = f"""
+    INSERT INTO fines (user_id, loan_id, amount, paid)
+    SELECT l.user_id, l.id,
+           DATEDIFF(COALESCE(l.return_date, %(as_of)s),
+                    l.due_date + INTERVAL {FINE_GRACE_DAYS} DAY) * {FINE_PER_DAY},
+           FALSE
+    FROM loans l
+    WHERE l.id > %(low)s AND l.id <= %(high)s
+      AND COALESCE(l.return_date, %(as_of)s) > l.due_date + INTERVAL {FINE_GRACE_DAYS} DAY
+    ON DUPLICATE KEY UPDATE amount = IF(paid, amount, VALUES(amount))
+"""
+
+
+def sweep(
+    as_of: date | None = None, chunk_size: int | None = None, restart: bool = False
+) -> dict:
+    as_of = as_of or date.today()
+    chunk_size = chunk_size or default_chunk_size()
+    stats = {"loans": 0, "fines": 0, "chunks": 0, "elapsed": 0.0}
+    started = perf_counter()
+
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            last_id = 0 if restart else load_checkpoint(cur, JOB)
+            if last_id:
+                print(f"Resuming after loan {last_id}")
+            while True:
+                cur.execute(NEXT_BOUNDARY, (last_id, chunk_size))
+                high, scanned = cur.fetchone()
+                if not scanned:
+                    break
+                cur.execute(
+                    ASSESS_CHUNK, {"as_of": as_of, "low": last_id, "high": high}
+                )
+                stats["fines"] += cur.rowcount
+                save_checkpoint(cur, JOB, high)
+                conn.commit()
+
+                last_id = high
+                stats["loans"] += scanned
+                stats["chunks"] += 1
+                elapsed = perf_counter() - started
+                print(
+                    f"  chunk {stats['chunks']}: loans up to {high}, "
+                    f"{stats['loans'] / elapsed:,.0f} loans/s"
+                )
+
+            save_checkpoint(cur, JOB, 0)
+            conn.commit()
+
+    stats["elapsed"] = perf_counter() - started
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assess fines for overdue loans.")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None)
+    parser.add_argument("--restart", action="store_true")
+    args = parser.parse_args()
+
+    result = sweep(args.as_of, args.chunk_size, args.restart)
+    rate = result["loans"] / result["elapsed"] if result["elapsed"] else 0
+    print(
+        f"Swept {result['loans']} loans in {result['chunks']} chunks, "
+        f"{result['fines']} fine rows affected, {result['elapsed']:.2f}s "
+        f"({rate:,.0f} loans/s)"
+    )
@@ -8,8 +8,14 @@ def main():
     choice = input("Choose interface: ")
     if choice == "1":
         from cli.cli import menu
+        from instrumentation import format_top_statements, top_statements
 
-        menu()
+        try:
+            menu()
+        finally:
+            if top_statements(1):
+                print("\nTop statements by cumulative time:")
+                print(format_top_statements())
     else:
         print("GUI not implemented. Exiting.")
 
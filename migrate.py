@@ -0,0 +1,190 @@
+import os
+import re
+import sys
+from time import perf_counter
+from db import get_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.(up|down)\.sql$")
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+    def __init__(self, version: str, name: str) -> None:
+        self.version = version
+        self.name = name
+        self.up_path = None
+        self.down_path = None
+
+    def __repr__(self) -> str:
+        return f"{self.version}_{self.name}"
+
+
+def discover(directory: str = MIGRATIONS_DIR) -> list[Migration]:
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version, name, direction = match.groups()
+        migration = migrations.setdefault(version, Migration(version, name))
+        if migration.name != name:
+            raise MigrationError(
+                f"Migration {version} has conflicting names: {migration.name}, {name}"
+            )
+        setattr(migration, f"{direction}_path", os.path.join(directory, filename))
+    for migration in migrations.values():
+        if migration.up_path is None:
+            raise MigrationError(f"Migration {migration} has no up script.")
+    return sorted(migrations.values(), key=lambda m: int(m.version))
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split a script on its delimiter, honouring mysql-client DELIMITER lines."""
+    statements = []
+    delimiter = ";"
+    buffer = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not buffer and (not stripped or stripped.startswith("--")):
+            continue
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        if stripped.endswith(delimiter):
+            buffer.append(line.rstrip()[: -len(delimiter)])
+            statement = "\n".join(buffer).strip()
+            if statement:
+                statements.append(statement)
+            buffer = []
+        else:
+            buffer.append(line)
+    trailing = "\n".join(buffer).strip()
+    if trailing:
+        statements.append(trailing)
+    return statements
+
+
+def ensure_tracking_table(cur) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          version VARCHAR(32) PRIMARY KEY,
+          name VARCHAR(255) NOT NULL,
+          applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+          duration_ms INT NOT NULL
+        )
+        """
+    )
+
+
+def applied_versions(cur) -> dict[str, tuple]:
+    cur.execute("SELECT version, name, applied_at, duration_ms FROM schema_migrations")
+    return {row[0]: row for row in cur.fetchall()}
+
+
+def run_script(cur, path: str) -> float:
+    with open(path, encoding="utf-8") as f:
+        statements = split_statements(f.read())
+    total = 0.0
+    for step, statement in enumerate(statements, 1):
+        summary = " ".join(statement.split())[:70]
+        started = perf_counter()
+        try:
+            cur.execute(statement)
+            if cur.with_rows:
+                cur.fetchall()
+        except Exception as e:
+            raise MigrationError(
+                f"{os.path.basename(path)} step {step} failed ({summary}): {e}"
+            ) from e
+        elapsed = perf_counter() - started
+        total += elapsed
+        print(f"    [{step}/{len(statements)}] {elapsed * 1000:8.1f} ms  {summary}")
+    return total
+
+
+def up(target: str | None = None) -> list[Migration]:
+    done = []
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            ensure_tracking_table(cur)
+            applied = applied_versions(cur)
+            for migration in discover():
+                if target is not None and int(migration.version) > int(target):
+                    break
+                if migration.version in applied:
+                    continue
+                print(f"Applying {migration}...")
+                elapsed = run_script(cur, migration.up_path)
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name, duration_ms) VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, round(elapsed * 1000)),
+                )
+                conn.commit()
+                print(f"Applied {migration} in {elapsed:.2f}s")
+                done.append(migration)
+    if not done:
+        print("Schema is up to date.")
+    return done
+
+
+def down(steps: int = 1) -> list[Migration]:
+    done = []
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            ensure_tracking_table(cur)
+            applied = applied_versions(cur)
+            for migration in reversed(discover()):
+                if len(done) >= steps:
+                    break
+                if migration.version not in applied:
+                    continue
+                if migration.down_path is None:
+                    raise MigrationError(f"Migration {migration} has no down script.")
+                print(f"Reverting {migration}...")
+                elapsed = run_script(cur, migration.down_path)
+                cur.execute(
+                    "DELETE FROM schema_migrations WHERE version = %s",
+                    (migration.version,),
+                )
+                conn.commit()
+                print(f"Reverted {migration} in {elapsed:.2f}s")
+                done.append(migration)
+    if not done:
+        print("Nothing to revert.")
+    return done
+
+
+def status() -> None:
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            ensure_tracking_table(cur)
+            applied = applied_versions(cur)
+    for migration in discover():
+        row = applied.get(migration.version)
+        if row:
+            print(f"  applied  {migration}  ({row[2]}, {row[3]} ms)")
+        else:
+            print(f"  pending  {migration}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    argument = sys.argv[2] if len(sys.argv) > 2 else None
+    try:
+        if command == "up":
+            up(argument)
+        elif command == "down":
+            down(int(argument or 1))
+        elif command == "status":
+            status()
+        else:
+            print("Usage: python migrate.py [up [version] | down [steps] | status]")
+            sys.exit(2)
+    except MigrationError as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
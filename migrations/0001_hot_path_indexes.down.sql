@@ -0,0 +1,16 @@
+-- Restore the single-column foreign-key indexes before dropping the composites.
+
+ALTER TABLE loans
+  ADD INDEX user_id (user_id),
+  DROP INDEX idx_loans_user_return,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE loans
+  ADD INDEX book_id (book_id),
+  DROP INDEX idx_loans_book_return,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE fines
+  ADD INDEX user_id (user_id),
+  DROP INDEX idx_fines_user_paid,
+  ALGORITHM=INPLACE, LOCK=NONE;
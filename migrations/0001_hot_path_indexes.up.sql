@@ -0,0 +1,17 @@
+-- Composite indexes for the hottest loan and fine predicates. Each one leads
+-- with the foreign-key column, so MySQL drops the implicit FK index it replaces.
+
+-- Active loans per user: eligibility check, Loan.get_by_user
+ALTER TABLE loans
+  ADD INDEX idx_loans_user_return (user_id, return_date),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Active loans per book: Loan.get_by_book
+ALTER TABLE loans
+  ADD INDEX idx_loans_book_return (book_id, return_date),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Unpaid fines per user: eligibility check, Fine.get_by_user
+ALTER TABLE fines
+  ADD INDEX idx_fines_user_paid (user_id, paid),
+  ALGORITHM=INPLACE, LOCK=NONE;
@@ -1,3 +1,7 @@
+ALTER TABLE users
+  DROP INDEX uq_users_single_admin,
+  DROP COLUMN admin_flag;
+
 DELIMITER $$
 
 CREATE TRIGGER prevent_second_admin_insert
@@ -0,0 +1,17 @@
+-- Enforce the single-admin rule with a unique index instead of triggers that
+-- count every admin row. admin_flag is 1 for the admin and NULL otherwise; a
+-- UNIQUE index allows any number of NULLs, so only one admin row can exist.
+-- The column is VIRTUAL and INVISIBLE: adding it is instant and SELECT * stays
+-- unchanged.
+
+DROP TRIGGER IF EXISTS prevent_second_admin_insert;
+DROP TRIGGER IF EXISTS prevent_second_admin_update;
+
+ALTER TABLE users
+  ADD COLUMN admin_flag TINYINT
+    GENERATED ALWAYS AS (IF(role = 'admin', 1, NULL)) VIRTUAL INVISIBLE,
+  ALGORITHM=INSTANT;
+
+ALTER TABLE users
+  ADD UNIQUE INDEX uq_users_single_admin (admin_flag),
+  ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,4 @@
+ALTER TABLE fines
+  ADD INDEX loan_id (loan_id),
+  DROP INDEX uq_fines_loan,
+  ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,20 @@
+-- A loan can be fined at most once. Duplicates left by concurrent returns are
+-- collapsed onto the earliest fine (keeping it paid if any duplicate was paid)
+-- before the unique index replaces the plain foreign-key index on loan_id.
+
+UPDATE fines keep
+  JOIN (
+    SELECT loan_id, MIN(id) AS id, MAX(paid) AS paid
+    FROM fines
+    WHERE loan_id IS NOT NULL
+    GROUP BY loan_id
+    HAVING COUNT(*) > 1
+  ) dup ON dup.id = keep.id
+SET keep.paid = dup.paid;
+
+DELETE extra FROM fines extra
+  JOIN fines keep ON keep.loan_id = extra.loan_id AND keep.id < extra.id;
+
+ALTER TABLE fines
+  ADD UNIQUE INDEX uq_fines_loan (loan_id),
+  ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,7 @@
+-- Progress of restartable batch jobs: the last key each job committed.
+
+CREATE TABLE IF NOT EXISTS job_checkpoints (
+  job VARCHAR(64) PRIMARY KEY,
+  last_id INT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
@@ -0,0 +1,8 @@
+DROP TRIGGER IF EXISTS summary_fine_delete;
+DROP TRIGGER IF EXISTS summary_fine_update;
+DROP TRIGGER IF EXISTS summary_fine_insert;
+DROP TRIGGER IF EXISTS summary_loan_delete;
+DROP TRIGGER IF EXISTS summary_loan_update;
+DROP TRIGGER IF EXISTS summary_loan_insert;
+DROP TRIGGER IF EXISTS summary_user_insert;
+DROP TABLE IF EXISTS user_account_summary;
@@ -0,0 +1,119 @@
+-- One row per user with the counters every borrow checks. Triggers keep it in
+-- step with loans and fines inside the writing statement's own transaction, so
+-- model saves, bulk imports, the fine sweep and ad-hoc SQL all stay consistent.
+-- Rebuild or verify it with: python -m jobs.account_summary [check|rebuild]
+
+CREATE TABLE IF NOT EXISTS user_account_summary (
+  user_id INT PRIMARY KEY,
+  active_loans INT NOT NULL DEFAULT 0,
+  unpaid_fines INT NOT NULL DEFAULT 0,
+  outstanding_total DECIMAL(10,2) NOT NULL DEFAULT 0,
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+INSERT INTO user_account_summary (user_id, active_loans, unpaid_fines, outstanding_total)
+SELECT u.id, COALESCE(l.active_loans, 0), COALESCE(f.unpaid_fines, 0), COALESCE(f.outstanding_total, 0)
+FROM users u
+LEFT JOIN (
+  SELECT user_id, COUNT(*) AS active_loans
+  FROM loans WHERE return_date IS NULL GROUP BY user_id
+) l ON l.user_id = u.id
+LEFT JOIN (
+  SELECT user_id, COUNT(*) AS unpaid_fines, SUM(amount) AS outstanding_total
+  FROM fines WHERE paid = FALSE GROUP BY user_id
+) f ON f.user_id = u.id
+ON DUPLICATE KEY UPDATE
+  active_loans = VALUES(active_loans),
+  unpaid_fines = VALUES(unpaid_fines),
+  outstanding_total = VALUES(outstanding_total);
+
+DELIMITER $$
+
+CREATE TRIGGER summary_user_insert
+AFTER INSERT ON users
+FOR EACH ROW
+BEGIN
+  INSERT IGNORE INTO user_account_summary (user_id) VALUES (NEW.id);
+END$$
+
+CREATE TRIGGER summary_loan_insert
+AFTER INSERT ON loans
+FOR EACH ROW
+BEGIN
+  IF NEW.user_id IS NOT NULL AND NEW.return_date IS NULL THEN
+    INSERT INTO user_account_summary (user_id, active_loans) VALUES (NEW.user_id, 1)
+    ON DUPLICATE KEY UPDATE active_loans = active_loans + 1;
+  END IF;
+END$$
+
+CREATE TRIGGER summary_loan_update
+AFTER UPDATE ON loans
+FOR EACH ROW
+BEGIN
+  IF OLD.user_id IS NOT NULL AND OLD.return_date IS NULL
+     AND NOT (NEW.user_id <=> OLD.user_id AND NEW.return_date IS NULL) THEN
+    UPDATE user_account_summary SET active_loans = active_loans - 1
+    WHERE user_id = OLD.user_id;
+  END IF;
+  IF NEW.user_id IS NOT NULL AND NEW.return_date IS NULL
+     AND NOT (NEW.user_id <=> OLD.user_id AND OLD.return_date IS NULL) THEN
+    INSERT INTO user_account_summary (user_id, active_loans) VALUES (NEW.user_id, 1)
+    ON DUPLICATE KEY UPDATE active_loans = active_loans + 1;
+  END IF;
+END$$
+
+CREATE TRIGGER summary_loan_delete
+AFTER DELETE ON loans
+FOR EACH ROW
+BEGIN
+  IF OLD.user_id IS NOT NULL AND OLD.return_date IS NULL THEN
+    UPDATE user_account_summary SET active_loans = active_loans - 1
+    WHERE user_id = OLD.user_id;
+  END IF;
+END$$
+
+CREATE TRIGGER summary_fine_insert
+AFTER INSERT ON fines
+FOR EACH ROW
+BEGIN
+  IF NEW.user_id IS NOT NULL AND NOT NEW.paid THEN
+    INSERT INTO user_account_summary (user_id, unpaid_fines, outstanding_total)
+    VALUES (NEW.user_id, 1, COALESCE(NEW.amount, 0))
+    ON DUPLICATE KEY UPDATE
+      unpaid_fines = unpaid_fines + 1,
+      outstanding_total = outstanding_total + COALESCE(NEW.amount, 0);
+  END IF;
+END$$
+
+CREATE TRIGGER summary_fine_update
+AFTER UPDATE ON fines
+FOR EACH ROW
+BEGIN
+  IF OLD.user_id IS NOT NULL AND NOT OLD.paid THEN
+    UPDATE user_account_summary
+    SET unpaid_fines = unpaid_fines - 1,
+        outstanding_total = outstanding_total - COALESCE(OLD.amount, 0)
+    WHERE user_id = OLD.user_id;
+  END IF;
+  IF NEW.user_id IS NOT NULL AND NOT NEW.paid THEN
+    INSERT INTO user_account_summary (user_id, unpaid_fines, outstanding_total)
+    VALUES (NEW.user_id, 1, COALESCE(NEW.amount, 0))
+    ON DUPLICATE KEY UPDATE
+      unpaid_fines = unpaid_fines + 1,
+      outstanding_total = outstanding_total + COALESCE(NEW.amount, 0);
+  END IF;
+END$$
+
+CREATE TRIGGER summary_fine_delete
+AFTER DELETE ON fines
+FOR EACH ROW
+BEGIN
+  IF OLD.user_id IS NOT NULL AND NOT OLD.paid THEN
+    UPDATE user_account_summary
+    SET unpaid_fines = unpaid_fines - 1,
+        outstanding_total = outstanding_total - COALESCE(OLD.amount, 0)
+    WHERE user_id = OLD.user_id;
+  END IF;
+END$$
+
+DELIMITER ;
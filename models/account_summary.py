@@ -0,0 +1,36 @@
+from __future__ import annotations
+from decimal import Decimal
+from db import Error, get_connection
+from models.exceptions import DatabaseOperationError
+
+
+class AccountSummary:
+    """Per-user loan and fine counters, kept current by triggers (migration 0005)."""
+
+    def __init__(
+        self,
+        user_id: int,
+        active_loans: int = 0,
+        unpaid_fines: int = 0,
+        outstanding_total: Decimal = Decimal("0"),
+    ) -> None:
+        self.user_id = user_id
+        self.active_loans = active_loans
+        self.unpaid_fines = unpaid_fines
+        self.outstanding_total = outstanding_total
+
+    @classmethod
+    def get_by_user(cls, user_id: int) -> AccountSummary:
+        try:
+            with get_connection() as conn:
+                with conn.cursor(dictionary=True) as cur:
+                    cur.execute(
+                        "SELECT * FROM user_account_summary WHERE user_id = %s",
+                        (user_id,),
+                    )
+                    row = cur.fetchone()
+        except Error as err:
+            raise DatabaseOperationError(
+                f"Failed to get account summary: {err}"
+            ) from err
+        return cls(**row) if row else cls(user_id)
@@ -0,0 +1,31 @@
+from typing import AsyncIterator
+from db import aiter_in_db_thread, run_in_db_thread
+
+
+class AsyncModel:
+    """Awaitable counterparts of the blocking model methods.
+
+    Each call runs the synchronous method on the DB executor, so validation,
+    queries and exceptions are exactly those of the blocking API. Listings
+    need the model's ``iter_all``.
+    """
+
+    @classmethod
+    async def aget_by_id(cls, record_id: int):
+        return await run_in_db_thread(cls.get_by_id, record_id)
+
+    async def asave(self) -> bool:
+        return await run_in_db_thread(self.save)
+
+    @classmethod
+    async def abulk_save(cls, records: list, chunk_size: int | None = None):
+        return await run_in_db_thread(cls.bulk_save, records, chunk_size)
+
+    @classmethod
+    async def aiter_all(cls, page_size: int | None = None) -> AsyncIterator:
+        async for record in aiter_in_db_thread(cls.iter_all(page_size), page_size):
+            yield record
+
+    @classmethod
+    async def aget_all(cls) -> list:
+        return [record async for record in cls.aiter_all()]
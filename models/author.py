@@ -1,6 +1,9 @@
 from __future__ import annotations
-from mysql.connector import Error
-from db import get_connection
+from functools import partial
+from db import Error, bulk_insert, current_unit_of_work, get_connection, on_commit
+from models.cache import reference_cache
+from models.aio import AsyncModel
+from models.tracking import ChangeTracking
 from models.validators import AuthorValidator
 from models.exceptions import (
     AuthorInUse,
@@ -11,7 +14,10 @@ from models.exceptions import (
 )
 
 
-class Author:
+class Author(ChangeTracking, AsyncModel):
+    cache = reference_cache("authors")
+    tracked_fields = ("name",)
+
     def __init__(self, name: str, id: int | None = None) -> None:
         self.id: int | None = id
         self.name: str = name
@@ -21,6 +27,9 @@ class Author:
         validator.validate(self)
 
     def save(self) -> bool:
+        if not self.changed_fields():
+            return True
+
         try:
             self.validate()
         except ValueError as e:
@@ -31,10 +40,14 @@ class Author:
         try:
             with get_connection() as conn:
                 with conn.cursor() as cur:
+                    updating = self.id is not None
                     cur.execute(query, values)
-                    if self.id is None:
+                    if not updating:
                         self.id = cur.lastrowid
                     conn.commit()
+                    if updating:
+                        on_commit(partial(self.cache.invalidate, self.id))
+            self.mark_clean()
             return True
         except Error as err:
             if err.errno == 1062 and "name" in err.msg.lower():
@@ -43,6 +56,35 @@ class Author:
                 )
             raise DatabaseOperationError(f"Unexpected database error: {err}") from err
 
+    @classmethod
+    def bulk_save(
+        cls, authors: list[Author], chunk_size: int | None = None
+    ) -> list[int]:
+        if not authors:
+            return []
+        if any(author.id is not None for author in authors):
+            raise ValueError("bulk_save only inserts new authors.")
+        try:
+            AuthorValidator().validate_many(authors)
+        except ValueError as e:
+            raise ValidationFailedError(f"Validation failed:\n{e}") from e
+
+        try:
+            ids = bulk_insert(
+                "INSERT INTO authors (name) VALUES (%s)",
+                [(author.name,) for author in authors],
+                chunk_size,
+                on_chunk=cls._assign_ids(authors),
+            )
+        except Error as err:
+            if err.errno == 1062 and "name" in err.msg.lower():
+                raise DuplicateNameError(
+                    f"Author name already exists: {err.msg}"
+                ) from err
+            raise DatabaseOperationError(f"Unexpected database error: {err}") from err
+
+        return ids
+
     def _build_query(self) -> tuple[str, tuple]:
         if self.id is None:
             return (
@@ -57,13 +99,20 @@ class Author:
 
     @classmethod
     def get_by_id(cls, author_id: int) -> Author:
-        with get_connection() as conn:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute("SELECT * FROM authors WHERE id = %s", (author_id,))
-                row = cur.fetchone()
-                if not row:
-                    raise AuthorNotFound(f"No author found with ID {author_id}")
-                return cls(**row)
+        loaded = cls._from_identity_map(author_id)
+        if loaded is not None:
+            return loaded
+        row = cls.cache.get(author_id)
+        if row is None:
+            with get_connection() as conn:
+                with conn.cursor(dictionary=True) as cur:
+                    cur.execute("SELECT * FROM authors WHERE id = %s", (author_id,))
+                    row = cur.fetchone()
+            if not row:
+                raise AuthorNotFound(f"No author found with ID {author_id}")
+            if current_unit_of_work() is None:
+                cls.cache.set(author_id, row)
+        return cls._from_row(row)
 
     @classmethod
     def get_by_name(cls, name: str) -> Author:
@@ -73,7 +122,7 @@ class Author:
                 row = cur.fetchone()
         if not row:
             raise AuthorNotFound(f"No author found with name '{name}'")
-        return cls(**row)
+        return cls._from_row(row)
 
     @classmethod
     def delete_by_name(cls, name: str) -> None:
@@ -89,7 +138,9 @@ class Author:
 
                     try:
                         cur.execute("DELETE FROM authors WHERE id = %s", (author_id,))
+                        cls._expire_identity(author_id)
                         conn.commit()
+                        on_commit(partial(cls.cache.invalidate, author_id))
                     except Error as err:
                         if err.errno == 1451:
                             cur.execute(
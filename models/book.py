@@ -1,6 +1,15 @@
 from __future__ import annotations
-from mysql.connector import Error
-from db import get_connection
+from typing import AsyncIterator, Iterator
+from db import (
+    Error,
+    aiter_in_db_thread,
+    bulk_insert,
+    get_connection,
+    iter_by_key,
+    run_in_db_thread,
+)
+from models.aio import AsyncModel
+from models.tracking import ChangeTracking
 from models.validators import BookValidator
 from models.exceptions import (
     BookInUse,
@@ -11,7 +20,17 @@ from models.exceptions import (
 )
 
 
-class Book:
+class Book(ChangeTracking, AsyncModel):
+    tracked_fields = (
+        "isbn",
+        "title",
+        "author_id",
+        "publisher_id",
+        "category_id",
+        "total_copies",
+        "available_copies",
+    )
+
     def __init__(
         self,
         isbn: str,
@@ -32,17 +51,21 @@ class Book:
         self.total_copies: int = total_copies
         self.available_copies: int = available_copies
 
-    def validate(self) -> None:
+    def validate(self, fields: list[str] | None = None) -> None:
         validator = BookValidator()
-        validator.validate(self)
+        validator.validate(self, fields)
 
     def save(self) -> bool:
+        fields = self.changed_fields()
+        if not fields:
+            return True
+
         try:
-            self.validate()
+            self.validate(fields)
         except ValueError as e:
             raise ValidationFailedError(f"Validation failed:\n{e}") from e
 
-        query, values = self._build_query()
+        query, values = self._build_query(fields)
 
         try:
             with get_connection() as conn:
@@ -51,6 +74,7 @@ class Book:
                     if self.id is None:
                         self.id = cur.lastrowid
                     conn.commit()
+            self.mark_clean()
             return True
         except Error as err:
             if err.errno == 1062 and "isbn" in err.msg.lower():
@@ -62,7 +86,35 @@ class Book:
                     f"Unexpected database error: {err}"
                 ) from err
 
-    def _build_query(self) -> tuple[str, tuple]:
+    @classmethod
+    def bulk_save(cls, books: list[Book], chunk_size: int | None = None) -> list[int]:
+        if not books:
+            return []
+        if any(book.id is not None for book in books):
+            raise ValueError("bulk_save only inserts new books.")
+        try:
+            BookValidator().validate_many(books)
+        except ValueError as e:
+            raise ValidationFailedError(f"Validation failed:\n{e}") from e
+
+        query = books[0]._build_query()[0]
+        try:
+            ids = bulk_insert(
+                query,
+                [book._build_query()[1] for book in books],
+                chunk_size,
+                on_chunk=cls._assign_ids(books),
+            )
+        except Error as err:
+            if err.errno == 1062 and "isbn" in err.msg.lower():
+                raise DuplicateISBNError(
+                    f"Book with this ISBN already exists: {err.msg}"
+                ) from err
+            raise DatabaseOperationError(f"Unexpected database error: {err}") from err
+
+        return ids
+
+    def _build_query(self, fields: list[str] | None = None) -> tuple[str, tuple]:
         if self.id is None:
             return (
                 """
@@ -80,34 +132,57 @@ class Book:
                 ),
             )
         else:
+            fields = fields or list(self.tracked_fields)
+            assignments = ", ".join(f"{field}=%s" for field in fields)
             return (
-                """
-                UPDATE books
-                SET isbn=%s, title=%s, author_id=%s, publisher_id=%s, category_id=%s,
-                    total_copies=%s, available_copies=%s
-                WHERE id=%s
-                """,
-                (
-                    self.isbn,
-                    self.title,
-                    self.author_id,
-                    self.publisher_id,
-                    self.category_id,
-                    self.total_copies,
-                    self.available_copies,
-                    self.id,
-                ),
+                f"UPDATE books SET {assignments} WHERE id=%s",
+                (*(getattr(self, field) for field in fields), self.id),
             )
 
     @classmethod
     def get_by_id(cls, book_id: int) -> Book:
+        loaded = cls._from_identity_map(book_id)
+        if loaded is not None:
+            return loaded
         with get_connection() as conn:
-            with conn.cursor(dictionary=True) as cur:
+            with conn.cursor(dictionary=True, prepared=True) as cur:
                 cur.execute("SELECT * FROM books WHERE id = %s", (book_id,))
                 row = cur.fetchone()
                 if not row:
                     raise BookNotFound(f"No book found with ID {book_id}")
-                return cls(**row)
+                return cls._from_row(row)
+
+    @classmethod
+    def reserve_copies(cls, book_id: int, count: int = 1) -> bool:
+        with get_connection() as conn:
+            with conn.cursor(prepared=True) as cur:
+                cur.execute(
+                    """
+                    UPDATE books SET available_copies = available_copies - %s
+                    WHERE id = %s AND available_copies >= %s
+                    """,
+                    (count, book_id, count),
+                )
+                reserved = cur.rowcount == 1
+                cls._expire_identity(book_id)
+                conn.commit()
+        return reserved
+
+    @classmethod
+    def release_copies(cls, book_id: int, count: int = 1) -> bool:
+        with get_connection() as conn:
+            with conn.cursor(prepared=True) as cur:
+                cur.execute(
+                    """
+                    UPDATE books SET available_copies = available_copies + %s
+                    WHERE id = %s AND available_copies + %s <= total_copies
+                    """,
+                    (count, book_id, count),
+                )
+                released = cur.rowcount == 1
+                cls._expire_identity(book_id)
+                conn.commit()
+        return released
 
     @classmethod
     def get_by_isbn(cls, isbn: str) -> Book:
@@ -117,7 +192,11 @@ class Book:
                 row = cur.fetchone()
         if not row:
             raise BookNotFound(f"No book found with ISBN: {isbn}")
-        return cls(**row)
+        return cls._from_row(row)
+
+    @classmethod
+    async def aget_by_isbn(cls, isbn: str) -> Book:
+        return await run_in_db_thread(cls.get_by_isbn, isbn)
 
     @classmethod
     def delete_by_isbn(cls, isbn: str) -> None:
@@ -133,6 +212,7 @@ class Book:
 
                     try:
                         cur.execute("DELETE FROM books WHERE id = %s", (book_id,))
+                        cls._expire_identity(book_id)
                         conn.commit()
                     except Error as err:
                         if err.errno == 1451:
@@ -153,8 +233,38 @@ class Book:
 
     @classmethod
     def get_all(cls) -> list["Book"]:
-        with get_connection() as conn:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute("SELECT * FROM books")
-                rows = cur.fetchall()
-                return [cls(**row) for row in rows]
+        return list(cls.iter_all())
+
+    @classmethod
+    def iter_all(cls, page_size: int | None = None) -> Iterator[Book]:
+        for row in iter_by_key("SELECT * FROM books", page_size=page_size):
+            yield cls._from_row(row)
+
+    @classmethod
+    def get_catalog(cls, page_size: int | None = None) -> Iterator[Book]:
+        rows = iter_by_key(
+            """
+            SELECT b.*, a.name AS author_name, p.name AS publisher_name,
+                   c.name AS category_name
+            FROM books b
+            LEFT JOIN authors a ON a.id = b.author_id
+            LEFT JOIN publishers p ON p.id = b.publisher_id
+            LEFT JOIN categories c ON c.id = b.category_id
+            """,
+            key="b.id",
+            page_size=page_size,
+        )
+        for row in rows:
+            author_name = row.pop("author_name")
+            publisher_name = row.pop("publisher_name")
+            category_name = row.pop("category_name")
+            book = cls._from_row(row)
+            book.author_name = author_name
+            book.publisher_name = publisher_name
+            book.category_name = category_name
+            yield book
+
+    @classmethod
+    async def aiter_catalog(cls, page_size: int | None = None) -> AsyncIterator[Book]:
+        async for book in aiter_in_db_thread(cls.get_catalog(page_size), page_size):
+            yield book
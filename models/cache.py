@@ -0,0 +1,66 @@
+import os
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+
+class TTLCache:
+    def __init__(self, ttl: float = 300.0, max_size: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key, value) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key=None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+
+reference_caches: dict[str, TTLCache] = {}
+
+
+def reference_cache(table: str) -> TTLCache:
+    cache = TTLCache(
+        ttl=float(os.getenv("REFERENCE_CACHE_TTL") or 300),
+        max_size=int(os.getenv("REFERENCE_CACHE_SIZE") or 1024),
+    )
+    reference_caches[table] = cache
+    return cache
+
+
+def reference_cache_stats() -> dict:
+    return {table: cache.stats() for table, cache in reference_caches.items()}
@@ -1,6 +1,9 @@
 from __future__ import annotations
-from mysql.connector import Error
-from db import get_connection
+from functools import partial
+from db import Error, bulk_insert, current_unit_of_work, get_connection, on_commit
+from models.cache import reference_cache
+from models.aio import AsyncModel
+from models.tracking import ChangeTracking
 from models.validators import CategoryValidator
 from models.exceptions import (
     DatabaseOperationError,
@@ -11,7 +14,10 @@ from models.exceptions import (
 )
 
 
-class Category:
+class Category(ChangeTracking, AsyncModel):
+    cache = reference_cache("categories")
+    tracked_fields = ("name",)
+
     def __init__(self, name: str, id: int | None = None) -> None:
         self.id = id
         self.name = name
@@ -21,6 +27,9 @@ class Category:
         validator.validate(self)
 
     def save(self) -> bool:
+        if not self.changed_fields():
+            return True
+
         try:
             self.validate()
         except ValueError as e:
@@ -31,10 +40,14 @@ class Category:
         try:
             with get_connection() as conn:
                 with conn.cursor() as cur:
+                    updating = self.id is not None
                     cur.execute(query, values)
-                    if self.id is None:
+                    if not updating:
                         self.id = cur.lastrowid
                     conn.commit()
+                    if updating:
+                        on_commit(partial(self.cache.invalidate, self.id))
+            self.mark_clean()
             return True
         except Error as err:
             if err.errno == 1062 and "name" in err.msg.lower():
@@ -43,6 +56,35 @@ class Category:
                 )
             raise DatabaseOperationError(f"Unexpected database error: {err}") from err
 
+    @classmethod
+    def bulk_save(
+        cls, categories: list[Category], chunk_size: int | None = None
+    ) -> list[int]:
+        if not categories:
+            return []
+        if any(category.id is not None for category in categories):
+            raise ValueError("bulk_save only inserts new categories.")
+        try:
+            CategoryValidator().validate_many(categories)
+        except ValueError as e:
+            raise ValidationFailedError(f"Validation failed:\n{e}") from e
+
+        try:
+            ids = bulk_insert(
+                "INSERT INTO categories (name) VALUES (%s)",
+                [(category.name,) for category in categories],
+                chunk_size,
+                on_chunk=cls._assign_ids(categories),
+            )
+        except Error as err:
+            if err.errno == 1062 and "name" in err.msg.lower():
+                raise DuplicateNameError(
+                    f"Category name already exists: {err.msg}"
+                ) from err
+            raise DatabaseOperationError(f"Unexpected database error: {err}") from err
+
+        return ids
+
     def _build_query(self) -> tuple[str, tuple]:
         if self.id is None:
             return (
@@ -57,13 +99,22 @@ class Category:
 
     @classmethod
     def get_by_id(cls, category_id: int) -> Category:
-        with get_connection() as conn:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute("SELECT * FROM categories WHERE id = %s", (category_id,))
-                row = cur.fetchone()
-                if not row:
-                    raise CategoryNotFound(f"No category found with ID {category_id}")
-                return cls(**row)
+        loaded = cls._from_identity_map(category_id)
+        if loaded is not None:
+            return loaded
+        row = cls.cache.get(category_id)
+        if row is None:
+            with get_connection() as conn:
+                with conn.cursor(dictionary=True) as cur:
+                    cur.execute(
+                        "SELECT * FROM categories WHERE id = %s", (category_id,)
+                    )
+                    row = cur.fetchone()
+            if not row:
+                raise CategoryNotFound(f"No category found with ID {category_id}")
+            if current_unit_of_work() is None:
+                cls.cache.set(category_id, row)
+        return cls._from_row(row)
 
     @classmethod
     def get_by_name(cls, name: str) -> Category:
@@ -73,7 +124,7 @@ class Category:
                 row = cur.fetchone()
         if not row:
             raise CategoryNotFound(f"No category found with name '{name}'")
-        return cls(**row)
+        return cls._from_row(row)
 
     @classmethod
     def delete_by_name(cls, name: str) -> None:
@@ -91,7 +142,9 @@ class Category:
                         cur.execute(
                             "DELETE FROM categories WHERE id = %s", (category_id,)
                         )
+                        cls._expire_identity(category_id)
                         conn.commit()
+                        on_commit(partial(cls.cache.invalidate, category_id))
                     except Error as err:
                         if err.errno == 1451:
                             cur.execute(
@@ -1,17 +1,28 @@
 from __future__ import annotations
-from mysql.connector import Error
-from db import get_connection
+from typing import Iterator
+from db import (
+    Error,
+    bulk_insert,
+    get_backend,
+    get_connection,
+    iter_by_key,
+    run_in_db_thread,
+)
 from models.exceptions import (
     ValidationFailedError,
     DatabaseOperationError,
     FineNotFound,
 )
+from models.aio import AsyncModel
+from models.tracking import ChangeTracking
 from models.validators import FineValidator
 
 FINE_STATUSES = {"all", "paid", "unpaid"}
 
 
-class Fine:
+class Fine(ChangeTracking, AsyncModel):
+    tracked_fields = ("user_id", "loan_id", "amount", "paid")
+
     def __init__(
         self,
         user_id: int,
@@ -26,13 +37,17 @@ class Fine:
         self.amount = amount
         self.paid = paid
 
-    def validate(self) -> None:
+    def validate(self, fields: list[str] | None = None) -> None:
         validator = FineValidator()
-        validator.validate(self)
+        validator.validate(self, fields)
 
     def save(self) -> bool:
+        fields = self.changed_fields()
+        if not fields:
+            return True
+
         try:
-            self.validate()
+            self.validate(fields)
         except ValueError as e:
             raise ValidationFailedError(f"Validation failed:\n{e}") from e
 
@@ -45,10 +60,70 @@ class Fine:
                     if self.id is None:
                         self.id = cur.lastrowid
                     conn.commit()
+            self.mark_clean()
             return True
         except Error as err:
             raise DatabaseOperationError(f"Database error: {err}") from err
 
+    @classmethod
+    def issue(cls, user_id: int, loan_id: int, amount: float) -> tuple[Fine, bool]:
+        """Create the fine for ``loan_id``, or return the one already issued.
+
+        ``uq_fines_loan`` makes the INSERT idempotent; on a duplicate an unpaid
+        fine (e.g. one accrued by the overdue sweep) takes the final amount and
+        a paid one is left alone. Returns the stored fine and whether it was
+        newly created.
+        """
+        fine = cls(user_id=user_id, loan_id=loan_id, amount=amount)
+        try:
+            fine.validate(["amount"])
+        except ValueError as e:
+            raise ValidationFailedError(f"Validation failed:\n{e}") from e
+
+        query, values = fine._build_query()
+        backend = get_backend()
+        try:
+            with get_connection() as conn:
+                with conn.cursor(dictionary=True) as cur:
+                    row, created = backend.upsert(
+                        cur,
+                        "fines",
+                        query,
+                        values,
+                        "loan_id",
+                        "amount = CASE WHEN paid THEN amount "
+                        f"ELSE {backend.excluded('amount')} END",
+                    )
+                    conn.commit()
+        except Error as err:
+            raise DatabaseOperationError(f"Failed to issue fine: {err}") from err
+        cls._expire_identity(row["id"])
+        return cls._from_row(row), created
+
+    @classmethod
+    def bulk_save(cls, fines: list[Fine], chunk_size: int | None = None) -> list[int]:
+        if not fines:
+            return []
+        if any(fine.id is not None for fine in fines):
+            raise ValueError("bulk_save only inserts new fines.")
+        try:
+            FineValidator().validate_many(fines)
+        except ValueError as e:
+            raise ValidationFailedError(f"Validation failed:\n{e}") from e
+
+        query = fines[0]._build_query()[0]
+        try:
+            ids = bulk_insert(
+                query,
+                [fine._build_query()[1] for fine in fines],
+                chunk_size,
+                on_chunk=cls._assign_ids(fines),
+            )
+        except Error as err:
+            raise DatabaseOperationError(f"Database error: {err}") from err
+
+        return ids
+
     def _build_query(self) -> tuple[str, tuple]:
         if self.id is None:
             return (
@@ -63,14 +138,17 @@ class Fine:
 
     @classmethod
     def get_by_id(cls, fine_id: int) -> Fine:
+        loaded = cls._from_identity_map(fine_id)
+        if loaded is not None:
+            return loaded
         try:
             with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
+                with conn.cursor(dictionary=True, prepared=True) as cur:
                     cur.execute("SELECT * FROM fines WHERE id = %s", (fine_id,))
                     row = cur.fetchone()
                     if not row:
                         raise FineNotFound(f"No fine found with ID {fine_id}")
-                    return cls(**row)
+                    return cls._from_row(row)
         except Error as err:
             raise DatabaseOperationError(f"Failed to get fine by ID: {err}") from err
 
@@ -94,25 +172,29 @@ class Fine:
                 query += " AND paid = FALSE"
 
             with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
+                with conn.cursor(dictionary=True, prepared=True) as cur:
                     cur.execute(query, params)
                     rows = cur.fetchall()
                     if not rows:
                         raise FineNotFound(f"No fines found for user with ID {user_id}")
-                    return [cls(**row) for row in rows]
+                    return [cls._from_row(row) for row in rows]
         except Error as err:
             raise DatabaseOperationError(f"Failed to get fines by user: {err}") from err
 
+    @classmethod
+    async def aget_by_user(cls, user_id: int, status: str = "all") -> list[Fine]:
+        return await run_in_db_thread(cls.get_by_user, user_id, status)
+
     @classmethod
     def get_by_loan(cls, loan_id: int) -> Fine:
         try:
             with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
+                with conn.cursor(dictionary=True, prepared=True) as cur:
                     cur.execute("SELECT * FROM fines WHERE loan_id = %s", (loan_id,))
                     row = cur.fetchone()
                     if not row:
                         raise FineNotFound(f"No fine found for loan with ID {loan_id}")
-                    return cls(**row)
+                    return cls._from_row(row)
         except Error as err:
             raise DatabaseOperationError(
                 f"Failed to get fine by loan ID: {err}"
@@ -120,12 +202,13 @@ class Fine:
 
     @classmethod
     def get_all(cls):
+        return list(cls.iter_all())
+
+    @classmethod
+    def iter_all(cls, page_size: int | None = None) -> Iterator[Fine]:
         try:
-            with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
-                    cur.execute("SELECT * FROM fines")
-                    results = cur.fetchall()
-                    return [cls(**row) for row in results]
+            for row in iter_by_key("SELECT * FROM fines", page_size=page_size):
+                yield cls._from_row(row)
         except Error as err:
             raise Exception(f"Failed to fetch fines: {err}")
 
@@ -134,6 +217,7 @@ class Fine:
         with get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("DELETE FROM fines WHERE id = %s", (fine_id,))
+                cls._expire_identity(fine_id)
                 if cur.rowcount == 0:
                     raise FineNotFound(f"Fine with ID {fine_id} not found.")
                 conn.commit()
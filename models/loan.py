@@ -1,7 +1,16 @@
 from __future__ import annotations
+from collections import Counter
+from typing import Iterator
 from datetime import date, timedelta
-from mysql.connector import Error
-from db import get_connection
+from db import (
+    Error,
+    bulk_insert,
+    default_chunk_size,
+    get_connection,
+    iter_by_key,
+    run_in_db_thread,
+    transaction,
+)
 from models.book import Book
 from models.exceptions import (
     ValidationFailedError,
@@ -9,12 +18,17 @@ from models.exceptions import (
     LoanNotFound,
 )
 from models.fine import Fine
+from models.aio import AsyncModel
+from models.tracking import ChangeTracking
 from models.validators import LoanValidator
 
 LOAN_STATUSES = {"all", "active", "returned"}
+FINE_GRACE_DAYS = 3
+FINE_PER_DAY = 25
 
 
-class Loan:
+class Loan(ChangeTracking, AsyncModel):
+    tracked_fields = ("user_id", "book_id", "loan_date", "due_date", "return_date")
 
     def __init__(
         self,
@@ -32,67 +46,119 @@ class Loan:
         self.due_date = due_date
         self.return_date = return_date
 
-    def validate(self) -> None:
+    def validate(self, fields: list[str] | None = None) -> None:
         validator = LoanValidator()
-        validator.validate(self, False if self.id else True)
+        validator.validate(self, False if self.id else True, fields)
 
     def check_for_fine(self):
+        """Fine a late return; returns the fine while it is unpaid.
+
+        That includes one the overdue sweep already accrued, which now holds
+        the final amount. A paid fine is left alone and not returned.
+        """
         if not self.return_date or not self.due_date:
             return
 
-        grace_period_end = self.due_date + timedelta(days=3)
+        grace_period_end = self.due_date + timedelta(days=FINE_GRACE_DAYS)
 
         if self.return_date > grace_period_end:
             overdue_days = (self.return_date - grace_period_end).days
-            fine_amount = overdue_days * 25
+            fine_amount = overdue_days * FINE_PER_DAY
 
-            try:
-                with get_connection() as conn:
-                    with conn.cursor(dictionary=True) as cur:
-                        cur.execute(
-                            "SELECT id FROM fines WHERE loan_id = %s", (self.id,)
-                        )
-                        fine = cur.fetchone()
+            fine, _ = Fine.issue(self.user_id, self.id, fine_amount)
+            return None if fine.paid else fine
 
-                        if fine:
-                            return
+    def save(self) -> bool:
+        create = self.id is None
+        fields = None if create else self.changed_fields()
+        if fields == []:
+            return True
 
-                fine = Fine(user_id=self.user_id, loan_id=self.id, amount=fine_amount)
-                fine.save()
-                return fine
+        try:
+            with transaction():
+                try:
+                    self.validate(fields)
+                except ValueError as e:
+                    raise ValidationFailedError(f"Validation failed:\n{e}") from e
 
-            except Error as err:
-                raise DatabaseOperationError(
-                    f"Failed to check or create fine: {err}"
-                ) from err
+                # Reserve before inserting so the loan's FK check runs against a
+                # row this transaction already holds exclusively.
+                if create and not Book.reserve_copies(self.book_id):
+                    raise ValidationFailedError(
+                        "Validation failed:\n"
+                        f"book_id: Book with ID {self.book_id} doesn't have any available copies."
+                    )
 
-    def save(self) -> bool:
+                with get_connection() as conn:
+                    with conn.cursor(prepared=True) as cur:
+                        if create:
+                            query, values = self._build_query()
+                            cur.execute(query, values)
+                            loan_id = cur.lastrowid
+                            returned = False
+                        else:
+                            loan_id = self.id
+                            returned = self._update_return_date(cur)
+
+                if returned:
+                    Book.release_copies(self.book_id)
+            self.id = loan_id
+            self.mark_clean()
+            return True
+        except Error as err:
+            raise DatabaseOperationError(f"Database error: {err}") from err
+
+    @classmethod
+    def bulk_save(cls, loans: list[Loan], chunk_size: int | None = None) -> list[int]:
+        """Import loans without the per-borrow eligibility rules.
+
+        Copies for still-active loans are reserved per book in the same
+        transaction as each chunk's insert.
+        """
+        if not loans:
+            return []
+        if any(loan.id is not None for loan in loans):
+            raise ValueError("bulk_save only inserts new loans.")
         try:
-            self.validate()
+            LoanValidator().validate_many(loans, False)
         except ValueError as e:
             raise ValidationFailedError(f"Validation failed:\n{e}") from e
 
-        query, values = self._build_query()
-        create = self.id is None
+        query = loans[0]._build_query()[0]
+        chunk_size = chunk_size or default_chunk_size()
+        ids = []
         try:
-            loaned_book = Book.get_by_id(self.book_id)
-            if create:
-                loaned_book.available_copies -= 1
-                loaned_book.save()
-            elif not create and self.return_date:
-                existing = Loan.get_by_id(self.id)
-                if existing.return_date is None:
-                    loaned_book.available_copies += 1
-                loaned_book.save()
-            with get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(query, values)
-                    if self.id is None:
-                        self.id = cur.lastrowid
-                    conn.commit()
-            return True
+            for start in range(0, len(loans), chunk_size):
+                chunk = loans[start : start + chunk_size]
+                active = Counter(l.book_id for l in chunk if l.return_date is None)
+                with transaction():
+                    for book_id in sorted(active):
+                        if not Book.reserve_copies(book_id, active[book_id]):
+                            raise ValidationFailedError(
+                                "Validation failed:\n"
+                                f"book_id: Book with ID {book_id} doesn't have {active[book_id]} available copies."
+                            )
+                    chunk_ids = bulk_insert(
+                        query, [loan._build_query()[1] for loan in chunk], len(chunk)
+                    )
+                # Only once the chunk's unit has committed.
+                cls._assign_ids(chunk)(0, chunk_ids)
+                ids.extend(chunk_ids)
         except Error as err:
             raise DatabaseOperationError(f"Database error: {err}") from err
+        return ids
+
+    def _update_return_date(self, cur) -> bool:
+        if self.return_date is not None:
+            cur.execute(
+                "UPDATE loans SET return_date=%s WHERE id=%s AND return_date IS NULL",
+                (self.return_date, self.id),
+            )
+            if cur.rowcount:
+                return True
+        query, values = self._build_query()
+        cur.execute(query, values)
+        return False
 
     def _build_query(self) -> tuple[str, tuple]:
         if self.id is None:
@@ -132,12 +198,12 @@ class Loan:
                 query += " AND return_date IS NOT NULL"
 
             with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
+                with conn.cursor(dictionary=True, prepared=True) as cur:
                     cur.execute(query, params)
                     rows = cur.fetchall()
                     if not rows:
                         raise LoanNotFound(f"No loan found for user with ID {user_id}")
-                    return [cls(**row) for row in rows]
+                    return [cls._from_row(row) for row in rows]
 
         except Error as err:
             raise DatabaseOperationError(f"Failed to get loans by user: {err}") from err
@@ -167,32 +233,44 @@ class Loan:
                     rows = cur.fetchall()
                     if not rows:
                         raise LoanNotFound(f"No loan found for book with ID {book_id}")
-                    return [cls(**row) for row in rows]
+                    return [cls._from_row(row) for row in rows]
 
         except Error as err:
             raise DatabaseOperationError(f"Failed to get loans by book: {err}") from err
 
+    @classmethod
+    async def aget_by_user(cls, user_id: int, status: str = "all") -> list[Loan]:
+        return await run_in_db_thread(cls.get_by_user, user_id, status)
+
+    @classmethod
+    async def aget_by_book(cls, book_id: int, status: str = "all") -> list[Loan]:
+        return await run_in_db_thread(cls.get_by_book, book_id, status)
+
     @classmethod
     def get_by_id(cls, loan_id: int) -> Loan:
+        loaded = cls._from_identity_map(loan_id)
+        if loaded is not None:
+            return loaded
         try:
             with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
+                with conn.cursor(dictionary=True, prepared=True) as cur:
                     cur.execute("SELECT * FROM loans WHERE id = %s", (loan_id,))
                     row = cur.fetchone()
                     if not row:
                         raise LoanNotFound(f"No loan found with ID {loan_id}")
-                    return cls(**row)
+                    return cls._from_row(row)
         except Error as err:
             raise DatabaseOperationError(f"Failed to get loan by ID: {err}") from err
 
     @classmethod
     def get_all(cls):
+        return list(cls.iter_all())
+
+    @classmethod
+    def iter_all(cls, page_size: int | None = None) -> Iterator[Loan]:
         try:
-            with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
-                    cur.execute("SELECT * FROM loans")
-                    results = cur.fetchall()
-                    return [cls(**row) for row in results]
+            for row in iter_by_key("SELECT * FROM loans", page_size=page_size):
+                yield cls._from_row(row)
         except Error as err:
             raise Exception(f"Failed to fetch loans: {err}")
 
@@ -201,6 +279,7 @@ class Loan:
         with get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("DELETE FROM loans WHERE id = %s", (loan_id,))
+                cls._expire_identity(loan_id)
                 if cur.rowcount == 0:
                     raise LoanNotFound(f"Loan with ID {loan_id} not found.")
                 conn.commit()
@@ -1,6 +1,9 @@
 from __future__ import annotations
-from mysql.connector import Error
-from db import get_connection
+from functools import partial
+from db import Error, bulk_insert, current_unit_of_work, get_connection, on_commit
+from models.cache import reference_cache
+from models.aio import AsyncModel
+from models.tracking import ChangeTracking
 from models.validators import PublisherValidator
 from models.exceptions import (
     DatabaseOperationError,
@@ -11,7 +14,10 @@ from models.exceptions import (
 )
 
 
-class Publisher:
+class Publisher(ChangeTracking, AsyncModel):
+    cache = reference_cache("publishers")
+    tracked_fields = ("name",)
+
     def __init__(self, name: str, id: int | None = None) -> None:
         self.id: int | None = id
         self.name: str = name
@@ -21,6 +27,9 @@ class Publisher:
         validator.validate(self)
 
     def save(self) -> bool:
+        if not self.changed_fields():
+            return True
+
         try:
             self.validate()
         except ValueError as e:
@@ -31,10 +40,14 @@ class Publisher:
         try:
             with get_connection() as conn:
                 with conn.cursor() as cur:
+                    updating = self.id is not None
                     cur.execute(query, values)
-                    if self.id is None:
+                    if not updating:
                         self.id = cur.lastrowid
                     conn.commit()
+                    if updating:
+                        on_commit(partial(self.cache.invalidate, self.id))
+            self.mark_clean()
             return True
         except Error as err:
             if err.errno == 1062 and "name" in err.msg.lower():
@@ -43,6 +56,35 @@ class Publisher:
                 )
             raise DatabaseOperationError(f"Unexpected database error: {err}") from err
 
+    @classmethod
+    def bulk_save(
+        cls, publishers: list[Publisher], chunk_size: int | None = None
+    ) -> list[int]:
+        if not publishers:
+            return []
+        if any(publisher.id is not None for publisher in publishers):
+            raise ValueError("bulk_save only inserts new publishers.")
+        try:
+            PublisherValidator().validate_many(publishers)
+        except ValueError as e:
+            raise ValidationFailedError(f"Validation failed:\n{e}") from e
+
+        try:
+            ids = bulk_insert(
+                "INSERT INTO publishers (name) VALUES (%s)",
+                [(publisher.name,) for publisher in publishers],
+                chunk_size,
+                on_chunk=cls._assign_ids(publishers),
+            )
+        except Error as err:
+            if err.errno == 1062 and "name" in err.msg.lower():
+                raise DuplicateNameError(
+                    f"Publisher name already exists: {err.msg}"
+                ) from err
+            raise DatabaseOperationError(f"Unexpected database error: {err}") from err
+
+        return ids
+
     def _build_query(self) -> tuple[str, tuple]:
         if self.id is None:
             return (
@@ -57,15 +99,22 @@ class Publisher:
 
     @classmethod
     def get_by_id(cls, publisher_id: int) -> Publisher:
-        with get_connection() as conn:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute("SELECT * FROM publishers WHERE id = %s", (publisher_id,))
-                row = cur.fetchone()
-                if not row:
-                    raise PublisherNotFound(
-                        f"No publisher found with ID {publisher_id}"
+        loaded = cls._from_identity_map(publisher_id)
+        if loaded is not None:
+            return loaded
+        row = cls.cache.get(publisher_id)
+        if row is None:
+            with get_connection() as conn:
+                with conn.cursor(dictionary=True) as cur:
+                    cur.execute(
+                        "SELECT * FROM publishers WHERE id = %s", (publisher_id,)
                     )
-                return cls(**row)
+                    row = cur.fetchone()
+            if not row:
+                raise PublisherNotFound(f"No publisher found with ID {publisher_id}")
+            if current_unit_of_work() is None:
+                cls.cache.set(publisher_id, row)
+        return cls._from_row(row)
 
     @classmethod
     def get_by_name(cls, name: str) -> Publisher:
@@ -75,7 +124,7 @@ class Publisher:
                 row = cur.fetchone()
         if not row:
             raise PublisherNotFound(f"No publisher found with name '{name}'")
-        return cls(**row)
+        return cls._from_row(row)
 
     @classmethod
     def delete_by_name(cls, name: str) -> None:
@@ -95,7 +144,9 @@ class Publisher:
                         cur.execute(
                             "DELETE FROM publishers WHERE id = %s", (publisher_id,)
                         )
+                        cls._expire_identity(publisher_id)
                         conn.commit()
+                        on_commit(partial(cls.cache.invalidate, publisher_id))
                     except Error as err:
                         if err.errno == 1451:
                             cur.execute(
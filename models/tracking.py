@@ -0,0 +1,77 @@
+from db import current_unit_of_work
+
+
+class ChangeTracking:
+    """Remembers the persisted values of ``tracked_fields`` to find what changed.
+
+    Inside a unit of work every loaded or saved instance is also kept in the
+    unit's identity map, so a primary key resolves to the same object, without
+    another query, until it is expired.
+    """
+
+    tracked_fields: tuple[str, ...] = ()
+
+    @classmethod
+    def _from_row(cls, row: dict):
+        loaded = cls._from_identity_map(row["id"])
+        if loaded is not None:
+            return loaded
+        instance = cls(**row)
+        instance.mark_clean()
+        return instance
+
+    @classmethod
+    def _from_identity_map(cls, record_id):
+        unit = current_unit_of_work()
+        return unit.identity_map.get(cls, record_id) if unit is not None else None
+
+    @classmethod
+    def _expire_identity(cls, record_id) -> None:
+        unit = current_unit_of_work()
+        if unit is not None:
+            unit.identity_map.expire(cls, record_id)
+
+    @staticmethod
+    def _assign_ids(records: list):
+        """``bulk_insert`` callback giving each committed chunk its ids."""
+
+        def assign(offset: int, ids: list[int]) -> None:
+            for record, record_id in zip(records[offset:], ids):
+                record.id = record_id
+                record.mark_clean()
+
+        return assign
+
+    def mark_clean(self) -> None:
+        self._original = {field: getattr(self, field) for field in self.tracked_fields}
+        unit = current_unit_of_work()
+        if unit is not None and self.id is not None:
+            unit.identity_map.add(self)
+
+    def changed_fields(self) -> list[str]:
+        original = getattr(self, "_original", None)
+        if original is None or self.id is None:
+            return list(self.tracked_fields)
+        return [
+            field
+            for field in self.tracked_fields
+            if getattr(self, field) != original[field]
+        ]
+
+    def expire(self) -> None:
+        """Drop this object from the identity map; the next load re-reads it."""
+        type(self)._expire_identity(self.id)
+
+    def refresh(self):
+        """Reload this object's row in place, discarding unsaved changes.
+
+        Always reads the database: a reference cache entry is dropped first.
+        """
+        self.expire()
+        cache = getattr(type(self), "cache", None)
+        if cache is not None:
+            cache.invalidate(self.id)
+        fresh = type(self).get_by_id(self.id)
+        self.__dict__.update(fresh.__dict__)
+        self.mark_clean()
+        return self
@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import Literal
+from typing import Iterator, Literal
 from datetime import date
-from mysql.connector import Error
-from auth import hash_password
-from db import get_connection
+from auth import get_auth_service, hash_password
+from db import Error, bulk_insert, get_connection, iter_by_key, run_in_db_thread
+from models.aio import AsyncModel
+from models.tracking import ChangeTracking
 from models.validators import UserValidator
 from models.exceptions import (
     AdminAlreadyExistsError,
@@ -15,7 +16,9 @@ from models.exceptions import (
 )
 
 
-class User:
+class User(ChangeTracking, AsyncModel):
+    tracked_fields = ("name", "email", "password")
+
     def __init__(
         self,
         name: str,
@@ -32,21 +35,27 @@ class User:
         self.joined_date = joined_date
         self.role = role
 
-    def validate(self) -> None:
+    def validate(self, fields: list[str] | None = None) -> None:
         validator = UserValidator()
-        validator.validate(self, False if self.id else True)
+        validator.validate(self, False if self.id else True, fields)
 
     def prepare_for_save(self):
-        self.password = hash_password(self.password)
+        if self.id is None or "password" in self.changed_fields():
+            self.password = hash_password(self.password)
 
     def save(self) -> bool:
+        create = self.id is None
+        fields = None if create else self.changed_fields()
+        if fields == []:
+            return True
+
         try:
-            self.validate()
+            self.validate(fields)
             self.prepare_for_save()
         except ValueError as e:
             raise ValidationFailedError(f"Validation failed:\n{e}") from e
 
-        query, values = self._build_query()
+        query, values = self._build_query(fields)
 
         try:
             with get_connection() as conn:
@@ -55,9 +64,12 @@ class User:
                     if self.id is None:
                         self.id = cur.lastrowid
                     conn.commit()
+            self.mark_clean()
             return True
         except Error as err:
-            if err.errno == 1644:
+            if err.errno == 1644 or (
+                err.errno == 1062 and "single_admin" in err.msg.lower()
+            ):
                 raise AdminAlreadyExistsError("Only one admin is allowed.") from err
             elif err.errno == 1062 and "email" in err.msg.lower():
                 raise DuplicateEmailError(
@@ -68,37 +80,98 @@ class User:
                     f"Unexpected database error: {err}"
                 ) from err
 
-    def _build_query(self) -> tuple[str, tuple]:
+    def rehash_password(self, raw: str) -> None:
+        hashed = hash_password(raw)
+        try:
+            with get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "UPDATE users SET password=%s WHERE id=%s", (hashed, self.id)
+                    )
+                    conn.commit()
+        except Error as err:
+            raise DatabaseOperationError(
+                f"Failed to update password hash: {err}"
+            ) from err
+        self.password = hashed
+        self.mark_clean()
+
+    @classmethod
+    def bulk_save(cls, users: list[User], chunk_size: int | None = None) -> list[int]:
+        if not users:
+            return []
+        if any(user.id is not None for user in users):
+            raise ValueError("bulk_save only inserts new users.")
+        try:
+            UserValidator().validate_many(users, True)
+        except ValueError as e:
+            raise ValidationFailedError(f"Validation failed:\n{e}") from e
+
+        hashes = get_auth_service().hash_many([user.password for user in users])
+        for user, hashed in zip(users, hashes):
+            user.password = hashed
+
+        query = users[0]._build_query()[0]
+        try:
+            ids = bulk_insert(
+                query,
+                [user._build_query()[1] for user in users],
+                chunk_size,
+                on_chunk=cls._assign_ids(users),
+            )
+        except Error as err:
+            if err.errno == 1644 or (
+                err.errno == 1062 and "single_admin" in err.msg.lower()
+            ):
+                raise AdminAlreadyExistsError("Only one admin is allowed.") from err
+            elif err.errno == 1062 and "email" in err.msg.lower():
+                raise DuplicateEmailError(
+                    f"A user with this email already exists: {err.msg}"
+                ) from err
+            raise DatabaseOperationError(f"Unexpected database error: {err}") from err
+
+        return ids
+
+    def _build_query(self, fields: list[str] | None = None) -> tuple[str, tuple]:
         if self.id is None:
             return (
                 "INSERT INTO users (name, email, password, joined_date, role) VALUES (%s, %s, %s, %s, %s)",
                 (self.name, self.email, self.password, self.joined_date, self.role),
             )
         else:
+            fields = fields or list(self.tracked_fields)
+            assignments = ", ".join(f"{field}=%s" for field in fields)
             return (
-                "UPDATE users SET name=%s, email=%s, password=%s WHERE id=%s",
-                (self.name, self.email, self.password, self.id),
+                f"UPDATE users SET {assignments} WHERE id=%s",
+                (*(getattr(self, field) for field in fields), self.id),
             )
 
     @classmethod
     def get_by_id(cls, user_id: int) -> User:
+        loaded = cls._from_identity_map(user_id)
+        if loaded is not None:
+            return loaded
         with get_connection() as conn:
-            with conn.cursor(dictionary=True) as cur:
+            with conn.cursor(dictionary=True, prepared=True) as cur:
                 cur.execute("SELECT * FROM users WHERE id = %s", (user_id,))
                 row = cur.fetchone()
                 if not row:
                     raise UserNotFound(f"No user found with ID {user_id}")
-                return cls(**row)
+                return cls._from_row(row)
 
     @classmethod
     def get_by_email(cls, email: str) -> User:
         with get_connection() as conn:
-            with conn.cursor(dictionary=True) as cur:
+            with conn.cursor(dictionary=True, prepared=True) as cur:
                 cur.execute("SELECT * FROM users WHERE email=%s", (email,))
                 row = cur.fetchone()
         if not row:
             raise UserNotFound(f"No user found with the email: {email}")
-        return cls(**row)
+        return cls._from_row(row)
+
+    @classmethod
+    async def aget_by_email(cls, email: str) -> User:
+        return await run_in_db_thread(cls.get_by_email, email)
 
     @classmethod
     def delete_by_email(cls, email: str) -> None:
@@ -114,6 +187,7 @@ class User:
 
                     try:
                         cur.execute("DELETE FROM users WHERE id = %s", (user_id,))
+                        cls._expire_identity(user_id)
                         conn.commit()
                     except Error as err:
                         if err.errno == 1451:
@@ -134,11 +208,12 @@ class User:
 
     @classmethod
     def get_all(cls):
+        return list(cls.iter_all())
+
+    @classmethod
+    def iter_all(cls, page_size: int | None = None) -> Iterator[User]:
         try:
-            with get_connection() as conn:
-                with conn.cursor(dictionary=True) as cur:
-                    cur.execute("SELECT * FROM users")
-                    results = cur.fetchall()
-                    return [cls(**row) for row in results]
+            for row in iter_by_key("SELECT * FROM users", page_size=page_size):
+                yield cls._from_row(row)
         except Error as err:
             raise Exception(f"Failed to fetch users: {err}")
@@ -1,11 +1,14 @@
 from datetime import date
 from decimal import Decimal
 from re import match
-from db import get_connection
+from db import default_chunk_size, get_backend, get_connection
+from models.cache import reference_caches
 
 
 class BaseValidator:
 
+    foreign_keys: dict[str, str] = {}
+
     @staticmethod
     def validate_to_be_in_english(text: str) -> bool:
         if not isinstance(text, str) or not text.isascii():
@@ -30,22 +33,110 @@ class BaseValidator:
         elif (d - today).days > 60:
             raise ValueError("Date can't be more than 60 days ahead.")
 
-    @staticmethod
-    def validate_foreign_key_exists(table: str, id_value: int):
-        BaseValidator.validate_to_be_whole_number(id_value)
+    def validate_many(self, records, *args):
+        errors = []
+        for index, record in enumerate(records):
+            try:
+                self.validate(record, *args)
+            except ValueError as e:
+                errors.append(f"[{index}] " + str(e).replace("\n", f"\n[{index}] "))
 
-        query = f"SELECT 1 FROM {table} WHERE id = %s LIMIT 1"
-        try:
+        if errors:
+            raise ValueError("\n".join(errors))
+
+    @staticmethod
+    def find_existing_ids(
+        ids_by_table: dict[str, set], chunk_size: int | None = None
+    ) -> dict[str, set]:
+        existing = {table: set() for table in ids_by_table}
+        pending = []
+        for table, ids in ids_by_table.items():
+            cache = reference_caches.get(table)
+            if cache is not None:
+                cached = {id_value for id_value in ids if cache.get(id_value)}
+                existing[table] |= cached
+                ids = [id_value for id_value in ids if id_value not in cached]
+            pending.extend((table, id_value) for id_value in ids)
+
+        chunk_size = chunk_size or default_chunk_size()
+        for start in range(0, len(pending), chunk_size):
+            ids_in_chunk = {}
+            for table, id_value in pending[start : start + chunk_size]:
+                ids_in_chunk.setdefault(table, []).append(id_value)
+            selects = []
+            params = []
+            for table, ids in ids_in_chunk.items():
+                placeholders = ", ".join(["%s"] * len(ids))
+                selects.append(
+                    f"SELECT '{table}' AS tbl, id FROM {table} WHERE id IN ({placeholders})"
+                )
+                params.extend(ids)
             with get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(query, (id_value,))
-                    result = cur.fetchone()
-                    if not result:
-                        raise ValueError(
-                            f"No entry found in '{table}' with id={id_value}"
-                        )
+                    cur.execute(" UNION ALL ".join(selects), params)
+                    for table, id_value in cur.fetchall():
+                        existing[table].add(id_value)
+        return existing
+
+    def resolve_foreign_keys(self, checked):
+        """Fill the pending foreign keys of ``checked``, one query per id chunk.
+
+        ``checked`` pairs each record with its error dict, in which foreign-key
+        fields that passed the local checks are present with a ``None`` value.
+        """
+        wanted = {}
+        for record, errors in checked:
+            for attr, table in self.foreign_keys.items():
+                if attr in errors and errors[attr] is None:
+                    wanted.setdefault(table, set()).add(getattr(record, attr))
+
+        try:
+            existing = self.find_existing_ids(wanted)
+            failure = None
         except Exception as e:
-            raise ValueError(f"Error validating foreign key for '{table}': {e}")
+            existing = {}
+            failure = e
+
+        for record, errors in checked:
+            for attr, table in self.foreign_keys.items():
+                if attr not in errors or errors[attr] is not None:
+                    continue
+                id_value = getattr(record, attr)
+                if failure is not None:
+                    errors[attr] = (
+                        f"Error validating foreign key for '{table}': {failure}"
+                    )
+                elif id_value in existing[table]:
+                    del errors[attr]
+                else:
+                    errors[attr] = self.missing_foreign_key(table, id_value)
+
+    @staticmethod
+    def missing_foreign_key(table: str, id_value) -> str:
+        return (
+            f"Error validating foreign key for '{table}': "
+            f"No entry found in '{table}' with id={id_value}"
+        )
+
+    @staticmethod
+    def format_errors(errors: dict) -> str:
+        return "\n".join(f"{k}: {v}" for k, v in errors.items())
+
+    def validate_checked(self, checked, indexed: bool = False):
+        self.resolve_foreign_keys(checked)
+        if not indexed:
+            errors = checked[0][1]
+            if errors:
+                raise ValueError(self.format_errors(errors))
+            return
+
+        messages = []
+        for index, (_, errors) in enumerate(checked):
+            if errors:
+                message = self.format_errors(errors)
+                messages.append(f"[{index}] " + message.replace("\n", f"\n[{index}] "))
+        if messages:
+            raise ValueError("\n".join(messages))
 
 
 class UserValidator(BaseValidator):
@@ -79,10 +170,12 @@ class UserValidator(BaseValidator):
                 f"Role '{role}' is not valid. Must be 'admin' or 'member'."
             )
 
-    def validate(self, user, create):
+    def validate(self, user, create, fields=None):
         errors = {}
 
         attrs = ["name", "email", "password", "joined_date", "role"]
+        if fields is not None:
+            attrs = [attr for attr in attrs if attr in fields]
 
         for attr in attrs:
             validator_name = f"validate_{attr}"
@@ -197,6 +290,12 @@ class CategoryValidator(BaseValidator):
 
 class BookValidator(BaseValidator):
 
+    foreign_keys = {
+        "author_id": "authors",
+        "publisher_id": "publishers",
+        "category_id": "categories",
+    }
+
     def validate_isbn(self, isbn):
         self.validate_to_be_in_english(isbn)
         if len(isbn) < 8:
@@ -212,13 +311,13 @@ class BookValidator(BaseValidator):
             raise ValueError("Title is too long.")
 
     def validate_author_id(self, author_id):
-        self.validate_foreign_key_exists("authors", author_id)
+        self.validate_to_be_whole_number(author_id)
 
     def validate_publisher_id(self, publisher_id):
-        self.validate_foreign_key_exists("publishers", publisher_id)
+        self.validate_to_be_whole_number(publisher_id)
 
     def validate_category_id(self, category_id):
-        self.validate_foreign_key_exists("categories", category_id)
+        self.validate_to_be_whole_number(category_id)
 
     def validate_total_copies(self, total_copies):
         self.validate_to_be_whole_number(total_copies)
@@ -229,7 +328,7 @@ class BookValidator(BaseValidator):
         if available_copies > total_copies:
             raise ValueError("Available copies cannot be more than total copies.")
 
-    def validate(self, book):
+    def check_fields(self, book, fields=None):
         errors = {}
 
         attrs = [
@@ -241,6 +340,10 @@ class BookValidator(BaseValidator):
             "total_copies",
             "available_copies",
         ]
+        if fields is not None:
+            if "total_copies" in fields:
+                fields = [*fields, "available_copies"]
+            attrs = [attr for attr in attrs if attr in fields]
 
         for attr in attrs:
             validator_name = f"validate_{attr}"
@@ -255,20 +358,34 @@ class BookValidator(BaseValidator):
                         if attr != "available_copies"
                         else validator(value, getattr(book, "total_copies"))
                     )
+                    if attr in self.foreign_keys:
+                        errors[attr] = None
                 except ValueError as e:
                     errors[attr] = str(e)
 
-        if errors:
-            raise ValueError("\n".join(f"{k}: {v}" for k, v in errors.items()))
+        return errors
+
+    def validate(self, book, fields=None):
+        self.validate_checked([(book, self.check_fields(book, fields))])
+
+    def validate_many(self, books):
+        self.validate_checked(
+            [(book, self.check_fields(book)) for book in books], indexed=True
+        )
 
 
 class LoanValidator(BaseValidator):
 
+    foreign_keys = {"user_id": "users", "book_id": "books"}
+
+    max_active_loans = 3
+    max_unpaid_fines = 2
+
     def validate_user_id(self, user_id):
-        self.validate_foreign_key_exists("users", user_id)
+        self.validate_to_be_whole_number(user_id)
 
     def validate_book_id(self, book_id):
-        self.validate_foreign_key_exists("books", book_id)
+        self.validate_to_be_whole_number(book_id)
 
     def validate_loan_date(self, loan_date):
         self.validate_date(loan_date)
@@ -280,54 +397,91 @@ class LoanValidator(BaseValidator):
         if return_date is not None:
             self.validate_date(return_date)
 
-    def validate_loan_count(self, user_id):
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT COUNT(*) FROM loans
-                    WHERE user_id = %s AND return_date IS NULL
-                    """,
-                    (user_id,),
-                )
-                count = cur.fetchone()[0]
-                if count >= 3:
-                    raise ValueError(
-                        f"User with ID {user_id} already has {count} active loans."
-                    )
+    def validate_loan_count(self, user_id, count):
+        if count >= self.max_active_loans:
+            raise ValueError(
+                f"User with ID {user_id} already has {count} active loans."
+            )
 
-    def validate_fine_count(self, user_id):
-        with get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT COUNT(*) FROM fines
-                    WHERE user_id = %s AND paid = FALSE
-                    """,
-                    (user_id,),
-                )
-                count = cur.fetchone()[0]
-                if count >= 2:
-                    raise ValueError(
-                        f"User with ID {user_id} has {count} unpaid fines and cannot borrow more books."
-                    )
+    def validate_fine_count(self, user_id, count):
+        if count >= self.max_unpaid_fines:
+            raise ValueError(
+                f"User with ID {user_id} has {count} unpaid fines and cannot borrow more books."
+            )
 
-    def validate_book_availability(self, book_id):
+    def validate_book_availability(self, book_id, available):
+        if available <= 0:
+            raise ValueError(
+                f"Book with ID {book_id} doesn't have any available copies."
+            )
+
+    eligibility_query = """
+        SELECT
+          EXISTS(SELECT 1 FROM users WHERE id = %s) AS user_exists,
+          COALESCE(s.active_loans, 0) AS active_loans,
+          COALESCE(s.unpaid_fines, 0) AS unpaid_fines,
+          EXISTS(SELECT 1 FROM books WHERE id = %s) AS book_exists,
+          (SELECT available_copies FROM books WHERE id = %s) AS available_copies
+        FROM (SELECT %s AS user_id) AS u
+        LEFT JOIN user_account_summary s ON s.user_id = u.user_id
+        """
+
+    @classmethod
+    def eligibility_sql(cls) -> str:
+        return cls.eligibility_query + get_backend().for_update("s")
+
+    @classmethod
+    def fetch_eligibility(cls, user_id, book_id) -> dict:
+        """Read the borrower's counters from their summary row.
+
+        Inside a borrow's unit of work a second borrow by the same user waits
+        instead of passing the same check: MySQL reads the row FOR UPDATE, and
+        SQLite units begin with BEGIN IMMEDIATE.
+        """
         with get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "SELECT available_copies FROM books WHERE id = %s",
-                    (book_id,),
-                )
-                available = cur.fetchone()[0]
-                if available <= 0:
-                    raise ValueError(
-                        f"Book with ID {book_id} doesn't have any available copies."
-                    )
+            with conn.cursor(dictionary=True, prepared=True) as cur:
+                cur.execute(cls.eligibility_sql(), (user_id, book_id, book_id, user_id))
+                return cur.fetchone()
+
+    def resolve_eligibility(self, loan, errors):
+        pending = [
+            field
+            for field in ("user_id", "book_id")
+            if field in errors and errors[field] is None
+        ]
+        if not pending:
+            return
 
-    def validate(self, loan, create):
+        try:
+            row = self.fetch_eligibility(loan.user_id, loan.book_id)
+        except Exception as e:
+            for field in pending:
+                errors[field] = (
+                    f"Error validating foreign key for '{self.foreign_keys[field]}': {e}"
+                )
+            return
+
+        for field in pending:
+            value = getattr(loan, field)
+            try:
+                if field == "user_id":
+                    if not row["user_exists"]:
+                        raise ValueError(self.missing_foreign_key("users", value))
+                    self.validate_loan_count(value, row["active_loans"])
+                    self.validate_fine_count(value, row["unpaid_fines"])
+                else:
+                    if not row["book_exists"]:
+                        raise ValueError(self.missing_foreign_key("books", value))
+                    self.validate_book_availability(value, row["available_copies"] or 0)
+                del errors[field]
+            except ValueError as e:
+                errors[field] = str(e)
+
+    def check_fields(self, loan, only=None):
         errors = {}
         fields = ["user_id", "book_id", "loan_date", "due_date", "return_date"]
+        if only is not None:
+            fields = [field for field in fields if field in only]
 
         for field in fields:
             validator = getattr(self, f"validate_{field}", None)
@@ -335,26 +489,36 @@ class LoanValidator(BaseValidator):
                 value = getattr(loan, field)
                 try:
                     validator(value)
-                    if field == "user_id" and create:
-                        self.validate_loan_count(value)
-                        self.validate_fine_count(value)
-                    elif field == "book_id" and create:
-                        self.validate_book_availability(value)
-
+                    if field in self.foreign_keys:
+                        errors[field] = None
                 except ValueError as e:
                     errors[field] = str(e)
 
-        if errors:
-            raise ValueError("\n".join(f"{k}: {v}" for k, v in errors.items()))
+        return errors
+
+    def validate(self, loan, create, fields=None):
+        errors = self.check_fields(loan, fields)
+        if create:
+            self.resolve_eligibility(loan, errors)
+        self.validate_checked([(loan, errors)])
+
+    def validate_many(self, loans, create=False):
+        checked = [(loan, self.check_fields(loan)) for loan in loans]
+        if create:
+            for loan, errors in checked:
+                self.resolve_eligibility(loan, errors)
+        self.validate_checked(checked, indexed=True)
 
 
 class FineValidator(BaseValidator):
 
+    foreign_keys = {"user_id": "users", "loan_id": "loans"}
+
     def validate_user_id(self, user_id):
-        self.validate_foreign_key_exists("users", user_id)
+        self.validate_to_be_whole_number(user_id)
 
     def validate_loan_id(self, loan_id):
-        self.validate_foreign_key_exists("loans", loan_id)
+        self.validate_to_be_whole_number(loan_id)
 
     def validate_amount(self, amount):
         self.validate_to_be_whole_number(amount)
@@ -363,9 +527,11 @@ class FineValidator(BaseValidator):
         if not isinstance(paid, bool):
             raise ValueError("Paid must be a boolean value.")
 
-    def validate(self, fine):
+    def check_fields(self, fine, only=None):
         errors = {}
         fields = ["user_id", "loan_id", "amount", "paid"]
+        if only is not None:
+            fields = [field for field in fields if field in only]
 
         for field in fields:
             validator = getattr(self, f"validate_{field}", None)
@@ -373,8 +539,17 @@ class FineValidator(BaseValidator):
                 value = getattr(fine, field)
                 try:
                     validator(value)
+                    if field in self.foreign_keys:
+                        errors[field] = None
                 except ValueError as e:
                     errors[field] = str(e)
 
-        if errors:
-            raise ValueError("\n".join(f"{k}: {v}" for k, v in errors.items()))
+        return errors
+
+    def validate(self, fine, fields=None):
+        self.validate_checked([(fine, self.check_fields(fine, fields))])
+
+    def validate_many(self, fines):
+        self.validate_checked(
+            [(fine, self.check_fields(fine)) for fine in fines], indexed=True
+        )
@@ -60,3 +60,12 @@ CREATE TABLE IF NOT EXISTS fines (
   FOREIGN KEY (user_id) REFERENCES users(id),
   FOREIGN KEY (loan_id) REFERENCES loans(id)
 );
+
+-- sessions (used when SESSION_STORE=table)
+CREATE TABLE IF NOT EXISTS sessions (
+  session_id VARCHAR(64) PRIMARY KEY,
+  user_id INT NOT NULL,
+  expires_at BIGINT NOT NULL,
+  INDEX idx_sessions_expires_at (expires_at),
+  FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
@@ -22,67 +22,92 @@ def clean_name(text, min_len=5, max_len=15):
     return text[:max_len]
 
 
-author_ids = []
-publisher_ids = []
-category_ids = []
-book_ids = []
-user_ids = []
-loan_ids = []
+def unique_by(records, key):
+    """Drop records whose ``key`` repeats; clean_name can map two inputs to one."""
+    seen = set()
+    unique = []
+    for record in records:
+        value = getattr(record, key).lower()
+        if value not in seen:
+            seen.add(value)
+            unique.append(record)
+    return unique
 
-for _ in range(100):
-    author = Author(name=clean_name(fake.unique.name()))
-    try:
-        author.save()
-        author_ids.append(author.id)
-    except Exception as e:
-        print(f"Failed to save author: {e}")
 
-for _ in range(100):
-    publisher = Publisher(name=clean_name(fake.unique.company()))
+def bulk_seed(model, records):
     try:
-        publisher.save()
-        publisher_ids.append(publisher.id)
+        return model.bulk_save(records)
     except Exception as e:
-        print(f"Failed to save publisher: {e}")
+        print(f"Failed to bulk save {model.__name__} records: {e}")
+        print("Saving them one by one instead...")
 
-for _ in range(100):
-    category = Category(name=clean_name(fake.unique.word()))
-    try:
-        category.save()
-        category_ids.append(category.id)
-    except Exception as e:
-        print(f"Failed to save category: {e}")
+    ids = []
+    for record in records:
+        record.id = None
+        try:
+            record.save()
+            ids.append(record.id)
+        except Exception as e:
+            print(f"Failed to save {model.__name__}: {e}")
+    return ids
 
-for _ in range(100):
-    user = User(
-        name=clean_name(fake.unique.name()),
-        email=fake.unique.email(),
-        password=fake.password(length=10),
-        role="member",
-    )
-    try:
-        user.save()
-        user_ids.append(user.id)
-    except Exception as e:
-        print(f"Failed to save user: {e}")
 
-for _ in range(100):
-    book = Book(
-        isbn=fake.unique.isbn13(),
-        title=fake.unique.sentence(nb_words=4).rstrip("."),
-        author_id=random.choice(author_ids),
-        publisher_id=random.choice(publisher_ids),
-        category_id=random.choice(category_ids),
-        total_copies=random.randint(100, 150),
-        available_copies=random.randint(80, 100),
+author_ids = bulk_seed(
+    Author,
+    unique_by(
+        [Author(name=clean_name(fake.unique.name())) for _ in range(100)], "name"
+    ),
+)
+publisher_ids = bulk_seed(
+    Publisher,
+    unique_by(
+        [Publisher(name=clean_name(fake.unique.company())) for _ in range(100)],
+        "name",
+    ),
+)
+category_ids = bulk_seed(
+    Category,
+    unique_by(
+        [Category(name=clean_name(fake.unique.word())) for _ in range(100)], "name"
+    ),
+)
+user_ids = bulk_seed(
+    User,
+    [
+        User(
+            name=clean_name(fake.unique.name()),
+            email=fake.unique.email(),
+            password=fake.password(length=10),
+            role="member",
+        )
+        for _ in range(100)
+    ],
+)
+book_ids = []
+if author_ids and publisher_ids and category_ids:
+    book_ids = bulk_seed(
+        Book,
+        [
+            Book(
+                isbn=fake.unique.isbn13(),
+                title=fake.unique.sentence(nb_words=4).rstrip("."),
+                author_id=random.choice(author_ids),
+                publisher_id=random.choice(publisher_ids),
+                category_id=random.choice(category_ids),
+                total_copies=random.randint(100, 150),
+                available_copies=random.randint(80, 100),
+            )
+            for _ in range(100)
+        ],
     )
-    try:
-        book.save()
-        book_ids.append(book.id)
-    except Exception as e:
-        print(f"Failed to save book: {e}")
+else:
+    print("Skipping books: no authors, publishers or categories were seeded.")
+loan_ids = []
+
+if not (user_ids and book_ids):
+    print("Skipping loans: no users or books were seeded.")
 
-for _ in range(100):
+for _ in range(100 if user_ids and book_ids else 0):
     returned = random.choice([True, False])
     return_date = (
         fake.date_between(
@@ -0,0 +1,226 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from time import time
+from db import get_connection
+
+
+class InvalidSessionError(Exception):
+    pass
+
+
+class Session:
+    def __init__(self, session_id: str, user_id: int, expires_at: int) -> None:
+        self.session_id = session_id
+        self.user_id = user_id
+        self.expires_at = expires_at
+
+
+class MemorySessionStore:
+    """Keeps sessions in process; expired entries are evicted on access or purge."""
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self._sessions: dict[str, Session] = {}
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "revoked": 0, "evicted": 0}
+
+    def put(self, session: Session) -> None:
+        with self._lock:
+            if len(self._sessions) >= self.max_size:
+                self._purge(time())
+            while len(self._sessions) >= self.max_size:
+                oldest = min(self._sessions.values(), key=lambda s: s.expires_at)
+                del self._sessions[oldest.session_id]
+                self._stats["evicted"] += 1
+            self._sessions[session.session_id] = session
+            self._stats["created"] += 1
+
+    def get(self, session_id: str) -> Session | None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session.expires_at <= time():
+                del self._sessions[session_id]
+                self._stats["evicted"] += 1
+                return None
+            return session
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                self._stats["revoked"] += 1
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge(time())
+
+    def _purge(self, now: float) -> int:
+        expired = [sid for sid, s in self._sessions.items() if s.expires_at <= now]
+        for session_id in expired:
+            del self._sessions[session_id]
+        self._stats["evicted"] += len(expired)
+        return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "active": len(self._sessions)}
+
+
+class TableSessionStore:
+    """Keeps sessions in the ``sessions`` table so every process shares them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "revoked": 0, "evicted": 0}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def put(self, session: Session) -> None:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO sessions (session_id, user_id, expires_at) VALUES (%s, %s, %s)",
+                    (session.session_id, session.user_id, session.expires_at),
+                )
+                conn.commit()
+        self._count("created")
+
+    def get(self, session_id: str) -> Session | None:
+        with get_connection() as conn:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(
+                    "SELECT session_id, user_id, expires_at FROM sessions WHERE session_id = %s",
+                    (session_id,),
+                )
+                row = cur.fetchone()
+        if row is None:
+            return None
+        if row["expires_at"] <= time():
+            self.delete(session_id, evicted=True)
+            return None
+        return Session(**row)
+
+    def delete(self, session_id: str, evicted: bool = False) -> None:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM sessions WHERE session_id = %s", (session_id,))
+                deleted = cur.rowcount
+                conn.commit()
+        if deleted:
+            self._count("evicted" if evicted else "revoked")
+
+    def purge_expired(self) -> int:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "DELETE FROM sessions WHERE expires_at <= %s", (int(time()),)
+                )
+                deleted = cur.rowcount
+                conn.commit()
+        self._count("evicted", deleted)
+        return deleted
+
+    def stats(self) -> dict:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT COUNT(*) FROM sessions WHERE expires_at > %s",
+                    (int(time()),),
+                )
+                (active,) = cur.fetchone()
+        with self._lock:
+            return {**self._stats, "active": active}
+
+
+class SessionManager:
+    """Issues HMAC-signed, expiring tokens of the form ``id.user.expiry.signature``.
+
+    Signature and expiry are checked before the store is consulted, so forged or
+    stale tokens never cost a lookup, and none of it involves bcrypt.
+    """
+
+    def __init__(self, store, secret: bytes, ttl: int = 3600) -> None:
+        self.store = store
+        self.ttl = ttl
+        self._secret = secret
+
+    def _sign(self, payload: str) -> str:
+        digest = hmac.new(self._secret, payload.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def create(self, user_id: int) -> str:
+        session = Session(secrets.token_urlsafe(24), user_id, int(time()) + self.ttl)
+        self.store.put(session)
+        payload = f"{session.session_id}.{session.user_id}.{session.expires_at}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def authenticate(self, token: str | None) -> Session:
+        try:
+            payload, signature = token.rsplit(".", 1)
+            session_id, user_id, expires_at = payload.split(".")
+            user_id, expires_at = int(user_id), int(expires_at)
+        except (AttributeError, ValueError) as e:
+            raise InvalidSessionError("Malformed session token.") from e
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidSessionError("Session token signature does not match.")
+        if expires_at <= time():
+            raise InvalidSessionError("Session has expired.")
+        session = self.store.get(session_id)
+        if session is None or session.user_id != user_id:
+            raise InvalidSessionError("Session has been revoked or evicted.")
+        return session
+
+    def is_live(self, token: str | None, user_id: int) -> bool:
+        """Whether ``token`` still authenticates ``user_id``."""
+        try:
+            return self.authenticate(token).user_id == user_id
+        except InvalidSessionError:
+            return False
+
+    def revoke(self, token: str | None) -> None:
+        try:
+            session = self.authenticate(token)
+        except InvalidSessionError:
+            return
+        self.store.delete(session.session_id)
+
+    def stats(self) -> dict:
+        return self.store.stats()
+
+
+_manager: SessionManager | None = None
+_manager_lock = threading.Lock()
+
+
+def configure_sessions(store=None, secret: bytes | None = None, ttl=None):
+    global _manager
+    if store is None:
+        kind = (os.getenv("SESSION_STORE") or "memory").strip().lower()
+        if kind not in ("memory", "table"):
+            raise ValueError(
+                f"Unknown SESSION_STORE '{kind}'. Expected 'memory' or 'table'."
+            )
+        store = TableSessionStore() if kind == "table" else MemorySessionStore()
+    if secret is None:
+        env_secret = os.getenv("SESSION_SECRET")
+        secret = env_secret.encode() if env_secret else secrets.token_bytes(32)
+    with _manager_lock:
+        _manager = SessionManager(
+            store, secret, int(ttl or os.getenv("SESSION_TTL") or 3600)
+        )
+    return _manager
+
+
+def get_session_manager() -> SessionManager:
+    if _manager is None:
+        configure_sessions()
+    return _manager
+
+
+def get_session_stats() -> dict:
+    return get_session_manager().stats()
@@ -0,0 +1,140 @@
+import asyncio
+from db import atransaction
+from models.author import Author
+from models.book import Book
+from models.category import Category
+from models.exceptions import AuthorNotFound, BookNotFound, DuplicateNameError
+from models.publisher import Publisher
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+async def delete_authors(names):
+    for name in names:
+        try:
+            await asyncio.to_thread(Author.delete_by_name, name)
+        except AuthorNotFound:
+            pass
+
+
+def test_concurrent_save_and_get():
+    names = [f"Async Author {i}" for i in range(10)]
+
+    async def scenario():
+        authors = [Author(name=name) for name in names]
+        try:
+            await asyncio.gather(*(author.asave() for author in authors))
+            fetched = await asyncio.gather(
+                *(Author.aget_by_id(author.id) for author in authors)
+            )
+            return [author.name for author in fetched]
+        finally:
+            await delete_authors(names)
+
+    try:
+        print_result("Save and fetch concurrently", asyncio.run(scenario()) == names)
+    except Exception as e:
+        print_result("Save and fetch concurrently", False)
+        print(e)
+
+
+def test_async_errors_match_sync():
+    async def scenario():
+        try:
+            await Book.aget_by_id(999999999)
+        except BookNotFound:
+            pass
+        else:
+            return False
+        author = Author(name="Async Duplicate")
+        await author.asave()
+        try:
+            await Author(name="Async Duplicate").asave()
+        except DuplicateNameError:
+            return True
+        finally:
+            await delete_authors(["Async Duplicate"])
+        return False
+
+    try:
+        print_result(
+            "Raise the same exceptions as the sync API", asyncio.run(scenario())
+        )
+    except Exception as e:
+        print_result("Raise the same exceptions as the sync API", False)
+        print(e)
+
+
+def test_aiter_all_pages():
+    isbns = [f"ASYNC0000{i}" for i in range(3)]
+
+    async def scenario():
+        author, publisher, category = (
+            Author(name="Async Paged Author"),
+            Publisher(name="Async Paged Publisher"),
+            Category(name="Async Paged Category"),
+        )
+        for record in (author, publisher, category):
+            await record.asave()
+        books = [
+            Book(
+                isbn=isbn,
+                title="Async Paged Book",
+                author_id=author.id,
+                publisher_id=publisher.id,
+                category_id=category.id,
+            )
+            for isbn in isbns
+        ]
+        try:
+            await Book.abulk_save(books)
+            seen = [book.id async for book in Book.aiter_all(page_size=2)]
+            return seen == sorted(seen) and all(book.id in seen for book in books)
+        finally:
+            for isbn in isbns:
+                try:
+                    await asyncio.to_thread(Book.delete_by_isbn, isbn)
+                except BookNotFound:
+                    pass
+            await asyncio.to_thread(Publisher.delete_by_name, publisher.name)
+            await asyncio.to_thread(Category.delete_by_name, category.name)
+            await delete_authors([author.name])
+
+    try:
+        print_result("Iterate books asynchronously", asyncio.run(scenario()))
+    except Exception as e:
+        print_result("Iterate books asynchronously", False)
+        print(e)
+
+
+def test_atransaction_rolls_back():
+    async def scenario():
+        author = Author(name="Async Rolled Back")
+        try:
+            async with atransaction():
+                await author.asave()
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        try:
+            await Author.aget_by_id(author.id)
+        except AuthorNotFound:
+            return True
+        await delete_authors([author.name])
+        return False
+
+    try:
+        print_result("Roll back an async unit of work", asyncio.run(scenario()))
+    except Exception as e:
+        print_result("Roll back an async unit of work", False)
+        print(e)
+
+
+if __name__ == "__main__":
+    print("Running Async model tests...\n")
+    test_concurrent_save_and_get()
+    test_async_errors_match_sync()
+    test_aiter_all_pages()
+    test_atransaction_rolls_back()
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from auth import (
+    AuthService,
+    AuthServiceBusyError,
+    configure_hasher,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+def test_hash_many_keeps_order():
+    service = AuthService(workers=2, max_pending=2)
+    try:
+        raws = [f"Secret{i}#" for i in range(4)]
+        hashes = service.hash_many(raws)
+        stats = service.stats()
+        print_result(
+            "Hash passwords in parallel and keep their order",
+            all(verify_password(raw, hashed) for raw, hashed in zip(raws, hashes))
+            and stats["hash_count"] == 4
+            and stats["max_pending_seen"] <= 2
+            and stats["pending"] == 0,
+        )
+    except Exception as e:
+        print_result("Hash passwords in parallel and keep their order", False)
+        print(e)
+    finally:
+        service.shutdown()
+
+
+def test_async_verify():
+    service = AuthService(workers=1)
+    try:
+
+        async def run():
+            hashed = await service.hash("Abc1234#")
+            return await service.verify("Abc1234#", hashed), await service.verify(
+                "Wrong123#", hashed
+            )
+
+        good, bad = asyncio.run(run())
+        print_result("Verify passwords from a coroutine", good and not bad)
+    except Exception as e:
+        print_result("Verify passwords from a coroutine", False)
+        print(e)
+    finally:
+        service.shutdown()
+
+
+def test_full_queue_rejects():
+    service = AuthService(workers=1, max_pending=1, queue_timeout=0)
+    gate = threading.Event()
+    try:
+        # Hold the only slot until the second submission has been refused.
+        first = service._submit("hash", gate.wait, block=False)
+        try:
+            service.submit_hash("Abc1234#")
+            rejected = False
+        except AuthServiceBusyError:
+            rejected = True
+        gate.set()
+        first.result()
+        print_result(
+            "Reject jobs when the auth queue is full",
+            rejected and service.stats()["rejected"] == 1,
+        )
+    except Exception as e:
+        print_result("Reject jobs when the auth queue is full", False)
+        print(e)
+    finally:
+        gate.set()
+        service.shutdown()
+
+
+def test_async_wait_keeps_loop_running():
+    service = AuthService(workers=1, max_pending=1, queue_timeout=5)
+    gate = threading.Event()
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while not gate.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        asyncio.get_running_loop().call_later(0.1, gate.set)
+        hashed = await service.hash("Abc1234#")
+        await ticker
+        return ticks, hashed
+
+    try:
+        # The only slot is held until the loop itself opens the gate.
+        first = service._submit("hash", gate.wait, block=False)
+        ticks, hashed = asyncio.run(run())
+        first.result()
+        print_result(
+            "Wait for a queue slot without blocking the event loop",
+            ticks > 1 and verify_password("Abc1234#", hashed),
+        )
+    except Exception as e:
+        print_result("Wait for a queue slot without blocking the event loop", False)
+        print(e)
+    finally:
+        gate.set()
+        service.shutdown()
+
+
+def test_needs_rehash_on_cost_change():
+    try:
+        configure_hasher(4)
+        old_hash = hash_password("Abc1234#")
+        fresh = needs_rehash(old_hash)
+        configure_hasher(5)
+        outdated = needs_rehash(old_hash)
+        new_hash = hash_password("Abc1234#")
+        print_result(
+            "Flag hashes stored at another bcrypt cost",
+            not fresh
+            and outdated
+            and not needs_rehash(new_hash)
+            and new_hash.split("$")[2] == "05"
+            and verify_password("Abc1234#", old_hash),
+        )
+    except Exception as e:
+        print_result("Flag hashes stored at another bcrypt cost", False)
+        print(e)
+    finally:
+        configure_hasher()
+
+
+if __name__ == "__main__":
+    print("\nRunning Auth tests...\n")
+    test_hash_many_keeps_order()
+    test_async_verify()
+    test_full_queue_rejects()
+    test_async_wait_keeps_loop_running()
+    test_needs_rehash_on_cost_change()
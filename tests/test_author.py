@@ -1,3 +1,4 @@
+from db import get_connection, transaction
 from models.author import Author
 from models.book import Book
 from models.category import Category
@@ -214,6 +215,149 @@ def test_author_in_use():
             pass
 
 
+def test_cached_author_invalidated_on_update():
+    try:
+        author = Author(name="Cached Author")
+        author.save()
+        Author.get_by_id(author.id)
+        hits_before = Author.cache.stats()["hits"]
+        Author.get_by_id(author.id)
+        cached = Author.cache.stats()["hits"] == hits_before + 1
+
+        author.name = "Renamed Author"
+        author.save()
+        print_result(
+            "Invalidate cached author on update",
+            cached and Author.get_by_id(author.id).name == "Renamed Author",
+        )
+    except Exception as e:
+        print_result("Invalidate cached author on update", False)
+        print(e)
+    finally:
+        for name in ("Cached Author", "Renamed Author"):
+            try:
+                Author.delete_by_name(name)
+            except AuthorNotFound:
+                pass
+
+
+def test_cache_untouched_by_rolled_back_unit():
+    try:
+        author = Author(name="Unit Cached Author")
+        author.save()
+        Author.cache.invalidate(author.id)
+        try:
+            with transaction():
+                loaded = Author.get_by_id(author.id)
+                loaded.name = "Uncommitted Author"
+                loaded.save()
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        print_result(
+            "Leave the cache alone inside a rolled back unit of work",
+            Author.cache.get(author.id) is None
+            and Author.get_by_id(author.id).name == "Unit Cached Author",
+        )
+    except Exception as e:
+        print_result("Leave the cache alone inside a rolled back unit of work", False)
+        print(e)
+    finally:
+        for name in ("Unit Cached Author", "Uncommitted Author"):
+            try:
+                Author.delete_by_name(name)
+            except AuthorNotFound:
+                pass
+
+
+def test_cache_invalidated_after_unit_commits():
+    try:
+        author = Author(name="Unit Cache Author")
+        author.save()
+        Author.get_by_id(author.id)
+        with transaction():
+            loaded = Author.get_by_id(author.id)
+            loaded.name = "Unit Renamed"
+            loaded.save()
+            still_cached = Author.cache.get(author.id) is not None
+        print_result(
+            "Invalidate the cache once the unit of work commits",
+            still_cached
+            and Author.cache.get(author.id) is None
+            and Author.get_by_id(author.id).name == "Unit Renamed",
+        )
+    except Exception as e:
+        print_result("Invalidate the cache once the unit of work commits", False)
+        print(e)
+    finally:
+        for name in ("Unit Cache Author", "Unit Renamed"):
+            try:
+                Author.delete_by_name(name)
+            except AuthorNotFound:
+                pass
+
+
+def test_refresh_bypasses_cache():
+    try:
+        author = Author(name="Refresh Author")
+        author.save()
+        Author.get_by_id(author.id)
+        with transaction():
+            loaded = Author.get_by_id(author.id)
+            with get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "UPDATE authors SET name = %s WHERE id = %s",
+                        ("Refreshed Author", author.id),
+                    )
+            loaded.refresh()
+        print_result(
+            "Refresh reads the database, not the cache",
+            loaded.name == "Refreshed Author",
+        )
+    except Exception as e:
+        print_result("Refresh reads the database, not the cache", False)
+        print(e)
+    finally:
+        for name in ("Refresh Author", "Refreshed Author"):
+            try:
+                Author.delete_by_name(name)
+            except AuthorNotFound:
+                pass
+
+
+def test_bulk_save_authors():
+    names = ["Bulk Author A", "Bulk Author B", "Bulk Author C"]
+    try:
+        authors = [Author(name=name) for name in names]
+        ids = Author.bulk_save(authors, chunk_size=2)
+        fetched = [Author.get_by_id(author_id).name for author_id in ids]
+        print_result(
+            "Bulk save authors",
+            fetched == names and [a.id for a in authors] == ids,
+        )
+    except Exception as e:
+        print_result("Bulk save authors", False)
+        print(e)
+    finally:
+        for name in names:
+            try:
+                Author.delete_by_name(name)
+            except AuthorNotFound:
+                pass
+
+
+def test_bulk_save_rejects_invalid_author():
+    try:
+        Author.bulk_save([Author(name="Valid Name"), Author(name="X")])
+        print_result("Reject invalid author in bulk save", False)
+    except ValidationFailedError as e:
+        print_result("Reject invalid author in bulk save", "[1]" in str(e))
+    except Exception as e:
+        print_result("Reject invalid author in bulk save", False)
+        print(e)
+
+
 if __name__ == "__main__":
     print("\nRunning Author tests...\n")
     test_create_valid_author()
@@ -227,3 +371,9 @@ if __name__ == "__main__":
     test_delete_author()
     test_delete_nonexistent_author()
     test_author_in_use()
+    test_cached_author_invalidated_on_update()
+    test_cache_untouched_by_rolled_back_unit()
+    test_cache_invalidated_after_unit_commits()
+    test_refresh_bypasses_cache()
+    test_bulk_save_authors()
+    test_bulk_save_rejects_invalid_author()
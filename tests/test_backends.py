@@ -0,0 +1,108 @@
+from backends.sqlite import SQLiteBackend, translate_query
+from backends.base import DatabaseError
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+def insert_user(cur, email, role="member"):
+    cur.execute(
+        "INSERT INTO users (name, email, password, joined_date, role) "
+        "VALUES (%s, %s, 'x', '2024-01-01', %s)",
+        ("Someone", email, role),
+    )
+    return cur.lastrowid
+
+
+def expect_errno(operation, errno):
+    try:
+        operation()
+    except DatabaseError as e:
+        return e.errno == errno
+    return False
+
+
+def test_translate_placeholders():
+    try:
+        print_result(
+            "Translate MySQL placeholders to SQLite",
+            translate_query("SELECT * FROM users WHERE id = %s AND name LIKE '%%a'")
+            == "SELECT * FROM users WHERE id = ? AND name LIKE '%a'"
+            and translate_query("WHERE id = %(id)s") == "WHERE id = :id",
+        )
+    except Exception as e:
+        print_result("Translate MySQL placeholders to SQLite", False)
+        print(e)
+
+
+def test_error_translation():
+    backend = SQLiteBackend(":memory:")
+    try:
+        with backend.connect() as conn:
+            cur = conn.cursor()
+            user_id = insert_user(cur, "dup@example.com")
+            insert_user(cur, "admin@example.com", "admin")
+            conn.commit()
+            duplicate = expect_errno(lambda: insert_user(cur, "dup@example.com"), 1062)
+            second_admin = expect_errno(
+                lambda: insert_user(cur, "admin2@example.com", "admin"), 1644
+            )
+            missing_parent = expect_errno(
+                lambda: cur.execute(
+                    "INSERT INTO loans (user_id, book_id, loan_date, due_date) "
+                    "VALUES (%s, 999, '2024-01-01', '2024-01-15')",
+                    (user_id,),
+                ),
+                1452,
+            )
+            conn.rollback()
+        print_result(
+            "Translate SQLite errors to MySQL error codes",
+            duplicate and second_admin and missing_parent,
+        )
+    except Exception as e:
+        print_result("Translate SQLite errors to MySQL error codes", False)
+        print(e)
+    finally:
+        backend.close()
+
+
+def test_summary_triggers():
+    backend = SQLiteBackend(":memory:")
+    try:
+        with backend.connect() as conn:
+            cur = conn.cursor(dictionary=True)
+            user_id = insert_user(cur, "reader@example.com")
+            cur.execute(
+                "INSERT INTO books (isbn, title, total_copies, available_copies) "
+                "VALUES ('123', 'Title', 1, 1)"
+            )
+            book_id = cur.lastrowid
+            cur.execute(
+                "INSERT INTO loans (user_id, book_id, loan_date, due_date) "
+                "VALUES (%s, %s, '2024-01-01', '2024-01-15')",
+                (user_id, book_id),
+            )
+            cur.execute(
+                "SELECT active_loans FROM user_account_summary WHERE user_id = %s",
+                (user_id,),
+            )
+            row = cur.fetchone()
+            conn.commit()
+        print_result(
+            "Port the account summary triggers",
+            row is not None and row["active_loans"] == 1,
+        )
+    except Exception as e:
+        print_result("Port the account summary triggers", False)
+        print(e)
+    finally:
+        backend.close()
+
+
+if __name__ == "__main__":
+    print("Running Backend tests...\n")
+    test_translate_placeholders()
+    test_error_translation()
+    test_summary_triggers()
@@ -9,7 +9,7 @@ from models.exceptions import (
     DuplicateISBNError,
     BookNotFound,
 )
-from db import get_connection
+from db import get_connection, transaction
 from models.author import Author
 from models.loan import Loan
 from models.publisher import Publisher
@@ -180,6 +180,29 @@ def test_empty_fields():
         print(e)
 
 
+def test_missing_foreign_key_message():
+    try:
+        book = Book(
+            isbn="MISSINGFK123",
+            title="Missing Author",
+            author_id=999999999,
+            publisher_id=seeded_publisher_id,
+            category_id=seeded_category_id,
+        )
+        book.save()
+        print_result("Report missing author", False)
+    except ValidationFailedError as e:
+        print_result(
+            "Report missing author",
+            "author_id: Error validating foreign key for 'authors': "
+            "No entry found in 'authors' with id=999999999" in str(e)
+            and "publisher_id" not in str(e),
+        )
+    except Exception as e:
+        print_result("Report missing author", False)
+        print(e)
+
+
 def test_get_by_id():
     try:
         book = Book(
@@ -265,6 +288,36 @@ def test_update_book_title():
         Book.delete_by_isbn(book.isbn)
 
 
+def test_unchanged_book_save_is_noop():
+    try:
+        book = Book(
+            isbn="NOOPSAVE1234",
+            title="No-op Save",
+            author_id=seeded_author_id,
+            publisher_id=seeded_publisher_id,
+            category_id=seeded_category_id,
+        )
+        book.save()
+        loaded = Book.get_by_id(book.id)
+        with transaction() as unit:
+            loaded.save()
+            untouched = unit.query_count
+            loaded.title = "Only Title Changed"
+            loaded.save()
+            title_only = unit.query_count - untouched
+        print_result(
+            "Skip unchanged save and validate only changed fields",
+            untouched == 0
+            and title_only == 1
+            and Book.get_by_id(book.id).title == "Only Title Changed",
+        )
+    except Exception as e:
+        print_result("Skip unchanged save and validate only changed fields", False)
+        print(e)
+    finally:
+        Book.delete_by_isbn("NOOPSAVE1234")
+
+
 def test_total_less_than_available():
     try:
         book = Book(
@@ -329,6 +382,60 @@ def test_delete_by_isbn():
         print(e)
 
 
+def test_get_catalog():
+    try:
+        book = Book(
+            isbn="CATALOG12345",
+            title="Catalog Entry",
+            author_id=seeded_author_id,
+            publisher_id=seeded_publisher_id,
+            category_id=seeded_category_id,
+        )
+        book.save()
+        entry = next(b for b in Book.get_catalog() if b.id == book.id)
+        print_result(
+            "List catalog with resolved names",
+            entry.author_name == "Default Author"
+            and entry.publisher_name == "Default Publisher"
+            and entry.category_name == "Default Category",
+        )
+    except Exception as e:
+        print_result("List catalog with resolved names", False)
+        print(e)
+    finally:
+        Book.delete_by_isbn("CATALOG12345")
+
+
+def test_iter_all_pages():
+    isbns = [f"PAGED00000{i}" for i in range(3)]
+    try:
+        ids = []
+        for isbn in isbns:
+            book = Book(
+                isbn=isbn,
+                title="Paged Book",
+                author_id=seeded_author_id,
+                publisher_id=seeded_publisher_id,
+                category_id=seeded_category_id,
+            )
+            book.save()
+            ids.append(book.id)
+        seen = [b.id for b in Book.iter_all(page_size=2)]
+        print_result(
+            "Iterate books in keyset pages",
+            seen == sorted(seen) and all(i in seen for i in ids),
+        )
+    except Exception as e:
+        print_result("Iterate books in keyset pages", False)
+        print(e)
+    finally:
+        for isbn in isbns:
+            try:
+                Book.delete_by_isbn(isbn)
+            except BookNotFound:
+                pass
+
+
 def test_book_in_use():
     try:
         user = User(name="Temp User", email="Temp@gmail.com", password="Abcd1234#")
@@ -410,13 +517,17 @@ if __name__ == "__main__":
         test_long_isbn()
         test_invalid_title()
         test_empty_fields()
+        test_missing_foreign_key_message()
         test_get_by_id()
         test_get_by_isbn()
         test_get_nonexistent_book()
         test_update_book_title()
+        test_unchanged_book_save_is_noop()
         test_total_less_than_available()
         test_negative_copies()
         test_delete_by_isbn()
+        test_get_catalog()
+        test_iter_all_pages()
         test_book_in_use()
     finally:
         print("\nCleaning up seeded foreign keys...")
@@ -0,0 +1,79 @@
+from time import sleep
+from models.cache import TTLCache
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+def test_hit_and_miss_counters():
+    try:
+        cache = TTLCache(ttl=60, max_size=10)
+        cache.set(1, {"id": 1, "name": "Cached"})
+        hit = cache.get(1)
+        miss = cache.get(2)
+        stats = cache.stats()
+        print_result(
+            "Count cache hits and misses",
+            hit["name"] == "Cached"
+            and miss is None
+            and stats["hits"] == 1
+            and stats["misses"] == 1,
+        )
+    except Exception as e:
+        print_result("Count cache hits and misses", False)
+        print(e)
+
+
+def test_entries_expire():
+    try:
+        cache = TTLCache(ttl=0.01, max_size=10)
+        cache.set(1, "value")
+        sleep(0.05)
+        print_result(
+            "Expire entries after TTL",
+            cache.get(1) is None and cache.stats()["expirations"] == 1,
+        )
+    except Exception as e:
+        print_result("Expire entries after TTL", False)
+        print(e)
+
+
+def test_least_recently_used_evicted():
+    try:
+        cache = TTLCache(ttl=60, max_size=2)
+        cache.set(1, "one")
+        cache.set(2, "two")
+        cache.get(1)
+        cache.set(3, "three")
+        print_result(
+            "Evict least recently used entry",
+            cache.get(2) is None
+            and cache.get(1) == "one"
+            and cache.stats()["evictions"] == 1,
+        )
+    except Exception as e:
+        print_result("Evict least recently used entry", False)
+        print(e)
+
+
+def test_invalidate():
+    try:
+        cache = TTLCache(ttl=60, max_size=10)
+        cache.set(1, "one")
+        cache.set(2, "two")
+        cache.invalidate(1)
+        single = cache.get(1) is None and cache.get(2) == "two"
+        cache.invalidate()
+        print_result("Invalidate entries", single and cache.stats()["size"] == 0)
+    except Exception as e:
+        print_result("Invalidate entries", False)
+        print(e)
+
+
+if __name__ == "__main__":
+    print("\nRunning Cache tests...\n")
+    test_hit_and_miss_counters()
+    test_entries_expire()
+    test_least_recently_used_evicted()
+    test_invalidate()
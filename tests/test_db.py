@@ -0,0 +1,262 @@
+import threading
+from time import sleep
+from db import ConnectionPool, PoolExhaustedError
+from instrumentation import count_queries
+from models.author import Author
+from models.exceptions import AuthorNotFound
+from models.validators import BaseValidator
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.executed = None
+        self.closed = False
+
+    def execute(self, operation, params=()):
+        # Like mysql.connector, prepare again unless handed the same object.
+        if operation is not self.executed:
+            self.executed = operation
+            self.connection.prepares += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.in_transaction = False
+        self.closed = False
+        self.rolled_back = False
+        self.prepares = 0
+        self.cursors = []
+
+    def cursor(self, prepared=False, dictionary=False):
+        cursor = FakeCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+    def is_connected(self):
+        return not self.closed
+
+    def rollback(self):
+        self.rolled_back = True
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+def test_connection_is_reused():
+    try:
+        pool = ConnectionPool(FakeConnection, size=2, max_overflow=0)
+        with pool.connection() as conn:
+            first = conn._conn
+        with pool.connection() as conn:
+            second = conn._conn
+        stats = pool.stats()
+        passed = first is second and stats["created"] == 1 and stats["checkouts"] == 2
+        print_result("Reuse pooled connection", passed)
+    except Exception as e:
+        print_result("Reuse pooled connection", False)
+        print(e)
+
+
+def test_pool_exhaustion():
+    try:
+        pool = ConnectionPool(FakeConnection, size=1, max_overflow=1, timeout=0.1)
+        first = pool.connection()
+        second = pool.connection()
+        try:
+            pool.connection()
+            print_result("Raise when pool is exhausted", False)
+        except PoolExhaustedError:
+            stats = pool.stats()
+            print_result(
+                "Raise when pool is exhausted",
+                stats["exhausted"] == 1 and stats["waits"] == 1,
+            )
+        finally:
+            first.close()
+            second.close()
+    except Exception as e:
+        print_result("Raise when pool is exhausted", False)
+        print(e)
+
+
+def test_overflow_closed_on_release():
+    try:
+        pool = ConnectionPool(FakeConnection, size=1, max_overflow=1)
+        first = pool.connection()
+        second = pool.connection()
+        overflow = second._conn
+        first.close()
+        second.close()
+        stats = pool.stats()
+        print_result(
+            "Close overflow connection on release",
+            overflow.closed and stats["idle"] == 1 and stats["open"] == 1,
+        )
+    except Exception as e:
+        print_result("Close overflow connection on release", False)
+        print(e)
+
+
+def test_waiter_gets_released_connection():
+    try:
+        pool = ConnectionPool(FakeConnection, size=1, max_overflow=0, timeout=2)
+        held = pool.connection()
+        result = {}
+
+        def worker():
+            with pool.connection() as conn:
+                result["conn"] = conn._conn
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        raw = held._conn
+        held.close()
+        thread.join()
+        print_result(
+            "Hand released connection to waiter",
+            result.get("conn") is raw and pool.stats()["waits"] == 1,
+        )
+    except Exception as e:
+        print_result("Hand released connection to waiter", False)
+        print(e)
+
+
+def test_uncommitted_work_rolled_back():
+    try:
+        pool = ConnectionPool(FakeConnection, size=1, max_overflow=0)
+        with pool.connection() as conn:
+            raw = conn._conn
+            raw.in_transaction = True
+        print_result("Roll back uncommitted work on release", raw.rolled_back)
+    except Exception as e:
+        print_result("Roll back uncommitted work on release", False)
+        print(e)
+
+
+def test_dead_connection_replaced_by_pre_ping():
+    try:
+        pool = ConnectionPool(
+            FakeConnection, size=1, max_overflow=0, pre_ping=True, ping_interval=0
+        )
+        with pool.connection() as conn:
+            dead = conn._conn
+        dead.closed = True
+        with pool.connection() as conn:
+            fresh = conn._conn
+        stats = pool.stats()
+        print_result(
+            "Replace dead connection on pre-ping",
+            fresh is not dead and stats["ping_failures"] == 1 and stats["open"] == 1,
+        )
+    except Exception as e:
+        print_result("Replace dead connection on pre-ping", False)
+        print(e)
+
+
+def test_idle_timeout():
+    try:
+        pool = ConnectionPool(FakeConnection, size=1, max_overflow=0, idle_timeout=0.01)
+        with pool.connection() as conn:
+            stale = conn._conn
+        sleep(0.05)
+        with pool.connection() as conn:
+            fresh = conn._conn
+        print_result(
+            "Discard idle connection after timeout", stale.closed and fresh is not stale
+        )
+    except Exception as e:
+        print_result("Discard idle connection after timeout", False)
+        print(e)
+
+
+def test_prepared_statement_reused():
+    try:
+        pool = ConnectionPool(FakeConnection, size=1, max_overflow=0)
+        for book_id in (1, 2, 3):
+            query = " ".join(["SELECT * FROM books", "WHERE id = %s"])
+            with pool.connection() as conn:
+                with conn.cursor(dictionary=True, prepared=True) as cur:
+                    cur.execute(query, (book_id,))
+                raw = conn._conn
+        stats = pool.stats()
+        print_result(
+            "Reuse prepared statements across checkouts",
+            raw.prepares == 1
+            and len(raw.cursors) == 1
+            and stats["statement_hits"] == 2
+            and stats["statement_misses"] == 1,
+        )
+    except Exception as e:
+        print_result("Reuse prepared statements across checkouts", False)
+        print(e)
+
+
+def test_statement_cache_evicts_lru():
+    try:
+        pool = ConnectionPool(
+            FakeConnection, size=1, max_overflow=0, statement_cache_size=2
+        )
+        with pool.connection() as conn:
+            for query in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"):
+                with conn.cursor(prepared=True) as cur:
+                    cur.execute(query)
+            first, second, third = conn._conn.cursors
+        stats = pool.stats()
+        print_result(
+            "Evict the least recently used prepared statement",
+            second.closed
+            and not first.closed
+            and not third.closed
+            and stats["statement_evictions"] == 1
+            and stats["statement_hit_rate"] == 0.25,
+        )
+    except Exception as e:
+        print_result("Evict the least recently used prepared statement", False)
+        print(e)
+
+
+def test_find_existing_ids_in_chunks():
+    names = ["Chunked Author A", "Chunked Author B", "Chunked Author C"]
+    try:
+        ids = Author.bulk_save([Author(name=name) for name in names])
+        Author.cache.invalidate()
+        with count_queries() as counter:
+            existing = BaseValidator.find_existing_ids(
+                {"authors": set(ids) | {999999999}}, chunk_size=2
+            )
+        print_result(
+            "Look up foreign keys one chunk at a time",
+            existing == {"authors": set(ids)} and counter.count == 2,
+        )
+    except Exception as e:
+        print_result("Look up foreign keys one chunk at a time", False)
+        print(e)
+    finally:
+        for name in names:
+            try:
+                Author.delete_by_name(name)
+            except AuthorNotFound:
+                pass
+
+
+if __name__ == "__main__":
+    print("\nRunning DB tests...\n")
+    test_connection_is_reused()
+    test_pool_exhaustion()
+    test_overflow_closed_on_release()
+    test_waiter_gets_released_connection()
+    test_uncommitted_work_rolled_back()
+    test_dead_connection_replaced_by_pre_ping()
+    test_idle_timeout()
+    test_prepared_statement_reused()
+    test_statement_cache_evicts_lru()
+    test_find_existing_ids_in_chunks()
@@ -140,8 +140,10 @@ def test_get_by_user_status_filters():
         fine1 = Fine(user_id=seeded_user_id, loan_id=seeded_loan_id, amount=10.0)
         fine1.save()
 
+        second_loan = Loan(user_id=seeded_user_id, book_id=seeded_book_id)
+        second_loan.save()
         fine2 = Fine(
-            user_id=seeded_user_id, loan_id=seeded_loan_id, amount=20.0, paid=True
+            user_id=seeded_user_id, loan_id=second_loan.id, amount=20.0, paid=True
         )
         fine2.save()
 
@@ -159,6 +161,7 @@ def test_get_by_user_status_filters():
     finally:
         Fine.delete_by_id(fine1.id)
         Fine.delete_by_id(fine2.id)
+        Loan.delete_by_id(second_loan.id)
 
 
 def test_get_by_loan():
@@ -177,6 +180,30 @@ def test_get_by_loan():
         Fine.delete_by_id(fine.id)
 
 
+def test_issue_returns_stored_fine():
+    try:
+        issued, created = Fine.issue(seeded_user_id, seeded_loan_id, 50.0)
+        issued.paid = True
+        issued.save()
+        again, created_again = Fine.issue(seeded_user_id, seeded_loan_id, 75.0)
+        print_result(
+            "Issue returns the stored fine, not the requested one",
+            created
+            and not created_again
+            and again.id == issued.id
+            and again.paid
+            and float(again.amount) == 50.0,
+        )
+    except Exception as e:
+        print_result("Issue returns the stored fine, not the requested one", False)
+        print(e)
+    finally:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM fines WHERE loan_id = %s", (seeded_loan_id,))
+                conn.commit()
+
+
 def test_delete_fine():
     try:
         fine = Fine(user_id=seeded_user_id, loan_id=seeded_loan_id, amount=35.0)
@@ -204,6 +231,7 @@ if __name__ == "__main__":
         test_get_nonexistent_fine()
         test_get_by_user_status_filters()
         test_get_by_loan()
+        test_issue_returns_stored_fine()
         test_delete_fine()
     finally:
         print("\nCleaning up seeded foreign keys...")
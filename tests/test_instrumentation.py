@@ -0,0 +1,124 @@
+import logging
+from instrumentation import (
+    configure_instrumentation,
+    count_queries,
+    logger,
+    reset_query_stats,
+    top_statements,
+)
+from models.author import Author
+from models.exceptions import AuthorNotFound
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+def delete_author(name):
+    try:
+        Author.delete_by_name(name)
+    except AuthorNotFound:
+        pass
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_count_queries_by_caller():
+    try:
+        author = Author(name="Counted Author")
+        with count_queries() as counter:
+            author.save()
+        callers = counter.by_caller()
+        print_result(
+            "Count queries and attribute them to the model method",
+            counter.count == 1 and callers == {"Author.save": 1},
+        )
+    except Exception as e:
+        print_result("Count queries and attribute them to the model method", False)
+        print(e)
+    finally:
+        delete_author("Counted Author")
+
+
+def test_rows_recorded():
+    try:
+        author = Author(name="Row Counted Author")
+        author.save()
+        Author.cache.invalidate()
+        with count_queries() as counter:
+            Author.get_by_name("Row Counted Author")
+        print_result(
+            "Record rows and parameters per statement",
+            counter.count == 1
+            and counter.records[0].rows == 1
+            and counter.records[0].params == ("Row Counted Author",),
+        )
+    except Exception as e:
+        print_result("Record rows and parameters per statement", False)
+        print(e)
+    finally:
+        delete_author("Row Counted Author")
+
+
+def test_top_statements():
+    configure_instrumentation(enabled=True)
+    reset_query_stats()
+    try:
+        names = [f"Top Author {i}" for i in range(3)]
+        for name in names:
+            Author(name=name).save()
+        top = top_statements(1)
+        print_result(
+            "Rank statements by cumulative time",
+            len(top) == 1
+            and top[0]["count"] >= 3
+            and top[0]["caller"] == "Author.save"
+            and top[0]["statement"].startswith("INSERT INTO authors"),
+        )
+    except Exception as e:
+        print_result("Rank statements by cumulative time", False)
+        print(e)
+    finally:
+        configure_instrumentation(enabled=False)
+        reset_query_stats()
+        for name in names:
+            delete_author(name)
+
+
+def test_slow_query_logged():
+    handler = CapturingHandler()
+    logger.addHandler(handler)
+    configure_instrumentation(slow_query_ms=0.000001)
+    try:
+        author = Author(name="Slow Author")
+        with count_queries():
+            author.save()
+        print_result(
+            "Log statements above the slow query threshold",
+            any(
+                "Author.save" in message and "INSERT INTO authors" in message
+                for message in handler.messages
+            ),
+        )
+    except Exception as e:
+        print_result("Log statements above the slow query threshold", False)
+        print(e)
+    finally:
+        configure_instrumentation(slow_query_ms=200)
+        logger.removeHandler(handler)
+        delete_author("Slow Author")
+
+
+if __name__ == "__main__":
+    print("Running Instrumentation tests...\n")
+    test_count_queries_by_caller()
+    test_rows_recorded()
+    test_top_statements()
+    test_slow_query_logged()
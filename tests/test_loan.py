@@ -1,4 +1,6 @@
-from datetime import timedelta
+import threading
+from datetime import date, timedelta
+from models.account_summary import AccountSummary
 from models.loan import Loan
 from models.book import Book
 from models.user import User
@@ -6,7 +8,7 @@ from models.exceptions import (
     ValidationFailedError,
     LoanNotFound,
 )
-from db import get_connection
+from db import get_connection, transaction
 from models.author import Author
 from models.publisher import Publisher
 from models.category import Category
@@ -218,13 +220,22 @@ def test_fine_created_for_late_return():
         loan = Loan.get_by_id(loan.id)
         loan.return_date = return_date
         loan.save()
-        loan.check_for_fine()
+        first = loan.check_for_fine()
+        again = loan.check_for_fine()
+        again.paid = True
+        again.save()
+        after_payment = loan.check_for_fine()
 
         with get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT amount FROM fines WHERE loan_id = %s", (loan.id,))
-                fine = cur.fetchone()
-                if fine and fine[0] == 25 * 7:
+                fines = cur.fetchall()
+                if (
+                    len(fines) == 1
+                    and fines[0][0] == 25 * 7
+                    and first.id == again.id
+                    and after_payment is None
+                ):
                     print_result("Fine created for late return", True)
                 else:
                     print_result("Fine created for late return", False)
@@ -253,7 +264,9 @@ def test_reject_loan_if_user_has_2_unpaid_fines():
                     """,
                         (seeded_user_id, loan.id, 50, False),
                     )
-                conn.commit()
+                    # Commit before the next borrow, which locks the same
+                    # account summary row from another connection.
+                    conn.commit()
 
         loan = Loan(user_id=seeded_user_id, book_id=seeded_book_id)
         loan.save()
@@ -333,6 +346,279 @@ def test_returning_book_increases_available_copies():
         Book.delete_by_isbn("RETURNTEST123")
 
 
+def test_borrow_runs_in_one_unit_of_work():
+    loan = None
+    try:
+        with transaction() as unit:
+            loan = Loan(user_id=seeded_user_id, book_id=seeded_book_id)
+            loan.save()
+        print_result("Borrow runs in one unit of work", unit.query_count == 3)
+    except Exception as e:
+        print_result("Borrow runs in one unit of work", False)
+        print(e)
+    finally:
+        if loan and loan.id:
+            Loan.delete_by_id(loan.id)
+
+
+def test_identity_map_within_unit_of_work():
+    loan = None
+    try:
+        with transaction() as unit:
+            loan = Loan(user_id=seeded_user_id, book_id=seeded_book_id)
+            loan.save()
+            queries = unit.query_count
+            same_loan = Loan.get_by_id(loan.id) is loan
+            book = Book.get_by_id(seeded_book_id)
+            same_book = Book.get_by_id(seeded_book_id) is book
+            cached = unit.query_count == queries + 1
+
+            book.title = "Unsaved Title"
+            book.refresh()
+            refreshed = book.title != "Unsaved Title"
+            book.expire()
+            reloaded = Book.get_by_id(seeded_book_id) is not book
+        outside = Loan.get_by_id(loan.id) is not loan
+        print_result(
+            "Reuse loaded objects within a unit of work",
+            same_loan and same_book and cached and refreshed and reloaded and outside,
+        )
+    except Exception as e:
+        print_result("Reuse loaded objects within a unit of work", False)
+        print(e)
+    finally:
+        if loan and loan.id:
+            Loan.delete_by_id(loan.id)
+
+
+def test_failed_borrow_rolls_back():
+    try:
+        book = Book(
+            isbn="ROLLBACK1234",
+            title="Rollback Test Book",
+            author_id=seeded_author_id,
+            publisher_id=seeded_publisher_id,
+            category_id=seeded_category_id,
+            total_copies=5,
+            available_copies=5,
+        )
+        book.save()
+        try:
+            with transaction():
+                Loan(user_id=seeded_user_id, book_id=book.id).save()
+                raise RuntimeError("abort borrow")
+        except RuntimeError:
+            pass
+
+        untouched = Book.get_by_id(book.id).available_copies == 5
+        no_loans = False
+        try:
+            Loan.get_by_book(book.id)
+        except LoanNotFound:
+            no_loans = True
+        print_result("Roll back failed borrow", untouched and no_loans)
+    except Exception as e:
+        print_result("Roll back failed borrow", False)
+        print(e)
+    finally:
+        Book.delete_by_isbn("ROLLBACK1234")
+
+
+def test_concurrent_borrows_do_not_oversell():
+    try:
+        book = Book(
+            isbn="HOTTITLE1234",
+            title="Hot Title",
+            author_id=seeded_author_id,
+            publisher_id=seeded_publisher_id,
+            category_id=seeded_category_id,
+            total_copies=2,
+            available_copies=2,
+        )
+        book.save()
+        results = []
+
+        def borrow():
+            try:
+                Loan(user_id=seeded_user_id, book_id=book.id).save()
+                results.append(True)
+            except ValidationFailedError:
+                results.append(False)
+
+        threads = [threading.Thread(target=borrow) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        remaining = Book.get_by_id(book.id).available_copies
+        print_result(
+            "No overselling under concurrent borrows",
+            results.count(True) == 2 and remaining == 0,
+        )
+    except Exception as e:
+        print_result("No overselling under concurrent borrows", False)
+        print(e)
+    finally:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM loans WHERE book_id = %s", (book.id,))
+                conn.commit()
+        Book.delete_by_isbn("HOTTITLE1234")
+
+
+def test_concurrent_borrows_respect_loan_limit():
+    user = None
+    book = None
+    try:
+        user = User(
+            name="Burst Borrower", email="burst@example.com", password="Test1234$"
+        )
+        user.save()
+        book = Book(
+            isbn="BURST12345",
+            title="Burst Title",
+            author_id=seeded_author_id,
+            publisher_id=seeded_publisher_id,
+            category_id=seeded_category_id,
+            total_copies=10,
+            available_copies=10,
+        )
+        book.save()
+        results = []
+
+        def borrow():
+            try:
+                Loan(user_id=user.id, book_id=book.id).save()
+                results.append(True)
+            except ValidationFailedError:
+                results.append(False)
+
+        threads = [threading.Thread(target=borrow) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        active = AccountSummary.get_by_user(user.id).active_loans
+        print_result(
+            "Enforce the loan limit under concurrent borrows by one member",
+            results.count(True) == 3 and active == 3,
+        )
+    except Exception as e:
+        print_result(
+            "Enforce the loan limit under concurrent borrows by one member", False
+        )
+        print(e)
+    finally:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                if user and user.id:
+                    cur.execute("DELETE FROM loans WHERE user_id = %s", (user.id,))
+                    cur.execute("DELETE FROM users WHERE id = %s", (user.id,))
+                if book and book.id:
+                    cur.execute("DELETE FROM books WHERE id = %s", (book.id,))
+                conn.commit()
+
+
+def test_account_summary_follows_loans():
+    loan = None
+    try:
+        before = AccountSummary.get_by_user(seeded_user_id).active_loans
+        loan = Loan(user_id=seeded_user_id, book_id=seeded_book_id)
+        loan.save()
+        borrowed = AccountSummary.get_by_user(seeded_user_id).active_loans
+        loan.return_date = loan.due_date
+        loan.save()
+        returned = AccountSummary.get_by_user(seeded_user_id).active_loans
+        print_result(
+            "Keep the account summary in step with loans",
+            borrowed == before + 1 and returned == before,
+        )
+    except Exception as e:
+        print_result("Keep the account summary in step with loans", False)
+        print(e)
+    finally:
+        if loan is not None and loan.id is not None:
+            Loan.delete_by_id(loan.id)
+
+
+def make_book(isbn, copies):
+    book = Book(
+        isbn=isbn,
+        title="Bulk Loan Book",
+        author_id=seeded_author_id,
+        publisher_id=seeded_publisher_id,
+        category_id=seeded_category_id,
+        total_copies=copies,
+        available_copies=copies,
+    )
+    book.save()
+    return book
+
+
+def delete_book_and_loans(book):
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM loans WHERE book_id = %s", (book.id,))
+            cur.execute("DELETE FROM books WHERE id = %s", (book.id,))
+            conn.commit()
+
+
+def test_bulk_save_reserves_copies():
+    book = make_book("BULKLOAN01", 5)
+    try:
+        loans = [
+            Loan(user_id=seeded_user_id, book_id=book.id),
+            Loan(user_id=seeded_user_id, book_id=book.id),
+            Loan(
+                user_id=seeded_user_id,
+                book_id=book.id,
+                return_date=date.today(),
+            ),
+        ]
+        ids = Loan.bulk_save(loans, chunk_size=2)
+        print_result(
+            "Bulk save loans and reserve copies for active ones",
+            [loan.id for loan in loans] == ids
+            and None not in ids
+            and Book.get_by_id(book.id).available_copies == 3,
+        )
+    except Exception as e:
+        print_result("Bulk save loans and reserve copies for active ones", False)
+        print(e)
+    finally:
+        delete_book_and_loans(book)
+
+
+def test_bulk_save_stops_when_copies_run_out():
+    book = make_book("BULKLOAN02", 1)
+    loans = [Loan(user_id=seeded_user_id, book_id=book.id) for _ in range(2)]
+    try:
+        try:
+            Loan.bulk_save(loans, chunk_size=1)
+            rejected = False
+        except ValidationFailedError:
+            rejected = True
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*) FROM loans WHERE book_id = %s", (book.id,))
+                (stored,) = cur.fetchone()
+        print_result(
+            "Roll back the bulk loan chunk that runs out of copies",
+            rejected
+            and stored == 1
+            and loans[0].id is not None
+            and loans[1].id is None
+            and Book.get_by_id(book.id).available_copies == 0,
+        )
+    except Exception as e:
+        print_result("Roll back the bulk loan chunk that runs out of copies", False)
+        print(e)
+    finally:
+        delete_book_and_loans(book)
+
+
 if __name__ == "__main__":
     print("\nRunning Loan tests...\n")
     seed_required_foreign_keys()
@@ -349,6 +635,14 @@ if __name__ == "__main__":
         test_reject_loan_if_user_has_2_unpaid_fines()
         test_available_copies_decrease_on_loan()
         test_returning_book_increases_available_copies()
+        test_borrow_runs_in_one_unit_of_work()
+        test_identity_map_within_unit_of_work()
+        test_failed_borrow_rolls_back()
+        test_concurrent_borrows_do_not_oversell()
+        test_concurrent_borrows_respect_loan_limit()
+        test_account_summary_follows_loans()
+        test_bulk_save_reserves_copies()
+        test_bulk_save_stops_when_copies_run_out()
     finally:
         print("\nCleaning up seeded foreign keys...")
         delete_seeded_foreign_keys()
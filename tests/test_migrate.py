@@ -0,0 +1,96 @@
+import os
+import tempfile
+from migrate import MigrationError, discover, split_statements
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+def test_split_plain_statements():
+    try:
+        statements = split_statements(
+            """
+            -- leading comment
+            ALTER TABLE loans
+              ADD INDEX idx (user_id),
+              ALGORITHM=INPLACE, LOCK=NONE;
+
+            DROP TABLE IF EXISTS old_table;
+            """
+        )
+        print_result(
+            "Split a script into statements",
+            len(statements) == 2
+            and statements[0].startswith("ALTER TABLE loans")
+            and statements[0].endswith("LOCK=NONE")
+            and statements[1] == "DROP TABLE IF EXISTS old_table",
+        )
+    except Exception as e:
+        print_result("Split a script into statements", False)
+        print(e)
+
+
+def test_split_honours_delimiter():
+    try:
+        statements = split_statements(
+            """
+            DELIMITER $$
+            CREATE TRIGGER first BEFORE INSERT ON users FOR EACH ROW
+            BEGIN
+              SET NEW.name = TRIM(NEW.name);
+            END$$
+
+            CREATE TRIGGER second BEFORE UPDATE ON users FOR EACH ROW
+            BEGIN
+              SET NEW.name = TRIM(NEW.name);
+            END$$
+            DELIMITER ;
+            """
+        )
+        print_result(
+            "Keep trigger bodies whole across DELIMITER changes",
+            len(statements) == 2
+            and all(s.startswith("CREATE TRIGGER") for s in statements)
+            and all(s.endswith("END") for s in statements),
+        )
+    except Exception as e:
+        print_result("Keep trigger bodies whole across DELIMITER changes", False)
+        print(e)
+
+
+def test_discover_orders_and_checks():
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for filename in (
+                "0010_later.up.sql",
+                "0002_second.up.sql",
+                "0002_second.down.sql",
+                "notes.txt",
+            ):
+                open(os.path.join(directory, filename), "w").close()
+            migrations = discover(directory)
+            ordered = [repr(m) for m in migrations] == ["0002_second", "0010_later"]
+            open(os.path.join(directory, "0011_orphan.down.sql"), "w").close()
+            try:
+                discover(directory)
+                rejected = False
+            except MigrationError:
+                rejected = True
+        print_result(
+            "Discover migrations in version order",
+            ordered
+            and migrations[0].down_path is not None
+            and migrations[1].down_path is None
+            and rejected,
+        )
+    except Exception as e:
+        print_result("Discover migrations in version order", False)
+        print(e)
+
+
+if __name__ == "__main__":
+    print("\nRunning Migration tests...\n")
+    test_split_plain_statements()
+    test_split_honours_delimiter()
+    test_discover_orders_and_checks()
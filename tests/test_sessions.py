@@ -0,0 +1,99 @@
+from time import sleep
+from sessions import (
+    InvalidSessionError,
+    MemorySessionStore,
+    SessionManager,
+)
+
+
+def print_result(test_name, passed):
+    print(f"{'✅' if passed else '❌'} {test_name}")
+
+
+def make_manager(ttl=60, max_size=100):
+    return SessionManager(MemorySessionStore(max_size), b"test-secret", ttl)
+
+
+def test_authenticate_valid_token():
+    try:
+        manager = make_manager()
+        token = manager.create(7)
+        session = manager.authenticate(token)
+        print_result(
+            "Authenticate a signed session token",
+            session.user_id == 7 and manager.stats()["active"] == 1,
+        )
+    except Exception as e:
+        print_result("Authenticate a signed session token", False)
+        print(e)
+
+
+def test_reject_tampered_token():
+    try:
+        manager = make_manager()
+        session_id, user_id, expires_at, signature = manager.create(7).split(".")
+        forged = f"{session_id}.1.{expires_at}.{signature}"
+        try:
+            manager.authenticate(forged)
+            rejected = False
+        except InvalidSessionError:
+            rejected = True
+        print_result("Reject a tampered session token", rejected)
+    except Exception as e:
+        print_result("Reject a tampered session token", False)
+        print(e)
+
+
+def test_revoke_and_expire():
+    try:
+        manager = make_manager(ttl=1)
+        revoked = manager.create(1)
+        expiring = manager.create(2)
+        manager.revoke(revoked)
+        sleep(1.1)
+        failures = 0
+        for token in (revoked, expiring):
+            try:
+                manager.authenticate(token)
+            except InvalidSessionError:
+                failures += 1
+        evicted = manager.store.purge_expired()
+        stats = manager.stats()
+        print_result(
+            "Revoke and evict expired sessions",
+            failures == 2
+            and evicted == 1
+            and stats["revoked"] == 1
+            and stats["evicted"] == 1
+            and stats["active"] == 0,
+        )
+    except Exception as e:
+        print_result("Revoke and evict expired sessions", False)
+        print(e)
+
+
+def test_is_live():
+    try:
+        manager = make_manager()
+        token = manager.create(7)
+        live = manager.is_live(token, 7)
+        other_user = manager.is_live(token, 8)
+        manager.revoke(token)
+        print_result(
+            "Report whether a session is still live",
+            live
+            and not other_user
+            and not manager.is_live(token, 7)
+            and not manager.is_live(None, 7),
+        )
+    except Exception as e:
+        print_result("Report whether a session is still live", False)
+        print(e)
+
+
+if __name__ == "__main__":
+    print("\nRunning Session tests...\n")
+    test_authenticate_valid_token()
+    test_reject_tampered_token()
+    test_revoke_and_expire()
+    test_is_live()
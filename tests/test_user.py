@@ -1,3 +1,4 @@
+from auth import verify_password
 from db import get_connection
 from models.author import Author
 from models.book import Book
@@ -174,6 +175,38 @@ def test_update_user():
         User.delete_by_email("john@example.com")
 
 
+def test_update_keeps_password_hash():
+    try:
+        user = User(
+            name="Hash Keeper",
+            email="hashkeeper@example.com",
+            password="Abc1234#",
+            role="member",
+        )
+        user.save()
+        stored = User.get_by_email("hashkeeper@example.com")
+        original_hash = stored.password
+        stored.name = "Hash Keeper Renamed"
+        stored.save()
+        renamed = User.get_by_email("hashkeeper@example.com")
+        renamed_hash = renamed.password
+        renamed.password = "Xyz9876$"
+        renamed.save()
+        changed = User.get_by_email("hashkeeper@example.com")
+        print_result(
+            "Re-hash password only when it changes",
+            renamed.name == "Hash Keeper Renamed"
+            and renamed_hash == original_hash
+            and changed.password != original_hash
+            and verify_password("Xyz9876$", changed.password),
+        )
+    except Exception as e:
+        print_result("Re-hash password only when it changes", False)
+        print(e)
+    finally:
+        User.delete_by_email("hashkeeper@example.com")
+
+
 def test_weak_password_no_uppercase():
     try:
         weak_user = User(
@@ -351,6 +384,31 @@ def test_user_in_use():
             pass
 
 
+def test_bulk_save_users():
+    emails = ["bulk1@example.com", "bulk2@example.com"]
+    try:
+        users = [
+            User(name="Bulk User", email=email, password="Bulk123@") for email in emails
+        ]
+        ids = User.bulk_save(users, chunk_size=1)
+        stored = [User.get_by_id(user_id) for user_id in ids]
+        print_result(
+            "Bulk save users with hashed passwords",
+            [user.id for user in users] == ids
+            and [user.email for user in stored] == emails
+            and all(verify_password("Bulk123@", user.password) for user in stored),
+        )
+    except Exception as e:
+        print_result("Bulk save users with hashed passwords", False)
+        print(e)
+    finally:
+        for email in emails:
+            try:
+                User.delete_by_email(email)
+            except UserNotFound:
+                pass
+
+
 if __name__ == "__main__":
     print("\nRunning User tests...\n")
     test_create_admin()
@@ -361,6 +419,7 @@ if __name__ == "__main__":
     test_get_user_by_email()
     test_get_nonexistent_user()
     test_update_user()
+    test_update_keeps_password_hash()
     test_weak_password_no_uppercase()
     test_weak_password_no_special_char()
     test_invalid_email_format()
@@ -368,3 +427,4 @@ if __name__ == "__main__":
     test_missing_fields()
     test_delete_user_by_email()
     test_user_in_use()
+    test_bulk_save_users()